@@ -1,34 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
-from starlette.background import BackgroundTasks
+from typing import List, Optional
 
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.schemas.comment import Comment, CommentCreate
-from app.crud.comment import create_comment, get_comments_by_post
-from app.api.deps import get_current_user
+from app.crud.comment import create_comment, get_comments_by_post, get_comment_tree, comment_row
+from app.crud.post import bump_popularity, COMMENT_WEIGHT
+from app.api.deps import get_current_user, get_current_user_optional
+from app.crud.vote import get_user_votes
+from app.crud import notification as crud_notification
+from app.api.pagination import encode_cursor, decode_cursor, parse_cursor_datetime, parse_cursor_int, set_next_cursor
 from app.models.user import User
 from app.models.post import Post
-from app.models.notification import Notification
 from app.models.comment import Comment as CommentModel
-from app.core.socket_manager import manager
+from app.core.notification_push import notification_pusher
+from app.core.vote_buffer import vote_buffer
 
 router = APIRouter()
 
-async def send_notification_ws(user_id: int, message: dict):
-    await manager.send_personal_message(message, user_id)
-
 @router.post("/", response_model=Comment, status_code=status.HTTP_201_CREATED)
 async def create_comment_endpoint(
     post_id: int, 
     comment: CommentCreate, 
-    background_tasks: BackgroundTasks,
     parent_id: int = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    new_comment = create_comment(
+    # Increment comment count
+    post = (await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            comments_count=Post.comments_count + 1,
+            popularity_score=Post.popularity_score + COMMENT_WEIGHT
+        )
+        .returning(Post.id, Post.author_id)
+    )).first()
+    if not post:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    new_comment = await create_comment(
         db=db, 
         comment=comment, 
         post_id=post_id, 
@@ -36,46 +50,112 @@ async def create_comment_endpoint(
         parent_id=parent_id
     )
     
-    # Increment comment count
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if post:
-        post.comments_count += 1
-        db.commit()
-        
-        # Notify Post Author (if not self)
-        if post.author_id != current_user.id:
-            # Create DB Notification
-            notif = Notification(
-                recipient_id=post.author_id,
-                sender_id=current_user.id,
-                type="comment",
-                title="New Comment",
-                message=f"{current_user.full_name} commented on your post",
-                reference_id=post.id,
-                reference_type="post",
-                created_at=datetime.utcnow()
-            )
-            db.add(notif)
-            db.commit()
-            
-            # Real-time Send
-            background_tasks.add_task(send_notification_ws, post.author_id, {
-                "type": "comment",
-                "title": "New Comment",
-                "message": f"{current_user.full_name} commented on your post",
-                "reference_id": post.id,
-                "sender": {
-                    "name": current_user.full_name,
-                    "profile_photo": current_user.profile_photo_url
-                },
-                "created_at": datetime.utcnow().isoformat()
-            })
+    # Notify Post Author (if not self); aggregated per post and window
+    message = None
+    if post.author_id and post.author_id != current_user.id:
+        message = await crud_notification.add_event(
+            db,
+            recipient_id=post.author_id,
+            sender=current_user,
+            type="comment",
+            title="New Comment",
+            action="commented on your post",
+            reference_id=post.id,
+        )
+    
+    # Comment, counter and notification in one transaction
+    await db.commit()
+    
+    # Real-time Send
+    if message:
+        count = await crud_notification.get_unread_count_async(db, post.author_id)
+        notification_pusher.queue(post.author_id, message)
+        notification_pusher.queue(post.author_id, crud_notification.unread_count_message(count))
 
-    return new_comment
+    return comment_row(new_comment, [])
 
 @router.get("/", response_model=List[Comment])
-def get_comments_endpoint(post_id: int, user_id: int = None, db: Session = Depends(get_db)):
-    return get_comments_by_post(db=db, post_id=post_id, user_id=user_id)
+def get_comments_endpoint(
+    post_id: int,
+    response: Response,
+    threaded: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    replies_limit: int = Query(5, ge=1, le=50),
+    depth: int = Query(3, ge=1, le=10),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Comments for a post.
+    
+    Default: the whole thread as a flat list (clients thread it via parent_id).
+    threaded=true: a bounded tree of `limit` top-level comments, `replies_limit`
+    replies per level and `depth` levels. More top-level comments: X-Next-Cursor.
+    Truncated branches: expand through the /{comment_id}/replies endpoint.
+    """
+    viewer_id = current_user.id if current_user else None
+    if not threaded:
+        comments = get_comments_by_post(db=db, post_id=post_id, user_id=viewer_id)
+        vote_buffer.merge_into("comment", comments)
+        _attach_user_votes(db, comments, viewer_id)
+        return comments
+    return _comment_page(db, response, post_id, None, cursor, viewer_id, limit, replies_limit, depth)
+
+@router.get("/{comment_id}/replies", response_model=List[Comment])
+def get_replies_endpoint(
+    post_id: int,
+    comment_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    replies_limit: int = Query(5, ge=1, le=50),
+    depth: int = Query(3, ge=1, le=10),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Lazily expand a branch: the next replies of `comment_id` as bounded subtrees.
+    Pass a comment's replies_cursor to continue after the replies already shown.
+    """
+    viewer_id = current_user.id if current_user else None
+    return _comment_page(db, response, post_id, comment_id, cursor, viewer_id, limit, replies_limit, depth)
+
+def _comment_page(db, response, post_id, parent_id, cursor, user_id, limit, replies_limit, depth):
+    after = None
+    if cursor:
+        created_at, comment_id = decode_cursor(cursor, 2)
+        after = (parse_cursor_datetime(created_at), parse_cursor_int(comment_id))
+    
+    comments, next_key = get_comment_tree(
+        db, post_id, user_id=user_id, parent_id=parent_id, after=after,
+        limit=limit, replies_limit=replies_limit, max_depth=depth
+    )
+    if next_key:
+        set_next_cursor(response, encode_cursor(*next_key))
+    
+    nodes = _flatten(comments)
+    for node in nodes:
+        # Partially sent branches continue after their last sent reply
+        if node["has_more_replies"] and node["replies"]:
+            last = node["replies"][-1]
+            node["replies_cursor"] = encode_cursor(last["created_at"], last["id"])
+    vote_buffer.merge_into("comment", nodes)
+    _attach_user_votes(db, nodes, user_id)
+    return comments
+
+def _flatten(nodes):
+    flat = []
+    for node in nodes:
+        flat.append(node)
+        flat.extend(_flatten(node["replies"]))
+    return flat
+
+def _attach_user_votes(db, comments, user_id):
+    """Fill user_vote for every comment in the response with one IN query."""
+    votes = get_user_votes(db, user_id, "comment", [c["id"] for c in comments])
+    for c in comments:
+        c["user_vote"] = votes.get(c["id"])
 
 @router.delete("/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_comment_endpoint(
@@ -97,6 +177,7 @@ def delete_comment_endpoint(
     post = db.query(Post).filter(Post.id == post_id).first()
     if post and post.comments_count > 0:
         post.comments_count -= 1
+        bump_popularity(post, -COMMENT_WEIGHT)
         
     db.commit()
     return None
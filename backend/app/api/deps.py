@@ -1,5 +1,5 @@
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 import firebase_admin
@@ -10,6 +10,8 @@ import random
 
 from app.db.session import get_db
 from app.models.user import User
+from app.core.auth_cache import principal_cache
+from app.core.rate_limit import RateLimiter
 
 # Initialize Firebase Admin (Singleton)
 from app.core.config import settings
@@ -57,6 +59,11 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    # 0. Recently verified token: skip crypto and the user lookup
+    cached_user = principal_cache.get(token.credentials)
+    if cached_user is not None:
+        return cached_user
+    
     try:
         # 1. Try Local JWT (Custom Auth)
         from jose import jwt, JWTError
@@ -66,6 +73,7 @@ def get_current_user(
             if email:
                 user = db.query(User).filter(User.email == email).first()
                 if user:
+                    principal_cache.put(token.credentials, payload, user)
                     return user
         except JWTError:
             # Not a local token, fall through to Firebase
@@ -122,6 +130,7 @@ def get_current_user(
              db.rollback()
              raise HTTPException(status_code=500, detail="Failed to create user account")
 
+    principal_cache.put(token.credentials, decoded_token, user)
     return user
 
 def get_current_user_optional(
@@ -146,3 +155,30 @@ def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
             detail="Antigravity Protocol: Access Denied. This sector is restricted to Team Codality High Command.",
         )
     return current_user
+
+
+def rate_limit(name: str, limit: int, window_seconds: int, detail: str = "Too many requests. Please slow down."):
+    """
+    Dependency factory: at most `limit` requests per `window_seconds` per client.
+    
+    Clients are keyed by user id when authenticated, else by IP address.
+    
+    Usage:
+        @router.post("/...", dependencies=[Depends(rate_limit("share", 5, 60))])
+    """
+    limiter = RateLimiter(name, limit, window_seconds)
+
+    def dependency(
+        request: Request,
+        current_user: Optional[User] = Depends(get_current_user_optional)
+    ) -> None:
+        if current_user:
+            key = f"user:{current_user.id}"
+        else:
+            # The client address behind a proxy only when the server trusts its
+            # X-Forwarded-For (--forwarded-allow-ips, see render.yaml)
+            key = f"ip:{request.client.host if request.client else 'unknown'}"
+        if not limiter.hit(key):
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=detail)
+
+    return dependency
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, Response
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from starlette.background import BackgroundTasks
 from typing import List, Optional
-from datetime import datetime
 
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.api import deps
+from app.api.pagination import encode_cursor, decode_cursor, parse_cursor_datetime, parse_cursor_int, set_next_cursor
 from app.models.notification import Notification
+from app.crud import notification as crud_notification
 from app.models.user import User
 from app.core.socket_manager import manager
 
@@ -29,49 +33,125 @@ async def websocket_endpoint(websocket: WebSocket, user_id: int):
 
 # API Endpoints
 
+def _announcement_entry(a, is_read: bool) -> dict:
+    # Negative ids keep announcements from colliding with notification ids
+    return {
+        "id": -a.id,
+        "type": "announcement",
+        "title": a.title,
+        "message": a.message,
+        "reference_id": a.id,
+        "reference_type": "announcement",
+        "is_read": is_read,
+        "created_at": a.created_at.isoformat(),
+        "sender": {
+            "id": a.sender.id,
+            "name": a.sender.full_name,
+            "profile_photo": a.sender.profile_photo_url
+        } if a.sender else None
+    }
+
+def _notification_entry(n) -> dict:
+    return {
+        "id": n.id,
+        "type": n.type,
+        "title": n.title,
+        "message": n.message,
+        "reference_id": n.reference_id,
+        "reference_type": n.reference_type,
+        "is_read": n.is_read,
+        "actor_count": n.actor_count,
+        "created_at": n.created_at.isoformat(),
+        "sender": {
+            "id": n.sender.id,
+            "name": n.sender.full_name,
+            "profile_photo": n.sender.profile_photo_url
+        } if n.sender else None
+    }
+
 @router.get("/", response_model=List[dict])
 def get_notifications(
+    response: Response,
     skip: int = 0, 
     limit: int = 20, 
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
     """
     Fetch paginated notifications for the current user.
+    
+    Personal notifications and shared announcements are merged by
+    (created_at, id), newest first. Announcement entries carry negative ids
+    (see mark_read).
+    
+    Paging: pass X-Next-Cursor back as `cursor` for keyset paging on
+    ix_notifications_recipient_created_at_id; `skip` (OFFSET) is kept for old
+    clients and ignored when a cursor is given. Either way the request is a
+    fixed number of queries: senders are joined, not loaded per row.
     """
-    notifications = db.query(Notification)\
-        .filter(Notification.recipient_id == current_user.id)\
-        .order_by(Notification.created_at.desc())\
-        .offset(skip)\
-        .limit(limit)\
+    before = None
+    if cursor:
+        created_at, entry_id = decode_cursor(cursor, 2)
+        before = (parse_cursor_datetime(created_at), parse_cursor_int(entry_id))
+        skip = 0
+    
+    query = db.query(Notification)\
+        .options(joinedload(Notification.sender))\
+        .filter(Notification.recipient_id == current_user.id)
+    if before:
+        query = query.filter(tuple_(Notification.created_at, Notification.id) < tuple_(*before))
+    notifications = query\
+        .order_by(Notification.created_at.desc(), Notification.id.desc())\
+        .limit(skip + limit)\
         .all()
     
     # Transform for frontend - Include sender info
-    result = []
-    for n in notifications:
-        result.append({
-            "id": n.id,
-            "type": n.type,
-            "title": n.title,
-            "message": n.message,
-            "reference_id": n.reference_id,
-            "reference_type": n.reference_type,
-            "is_read": n.is_read,
-            "created_at": n.created_at.isoformat(),
-            "sender": {
-                "id": n.sender.id,
-                "name": n.sender.full_name,
-                "profile_photo": n.sender.profile_photo_url
-            } if n.sender else None
-        })
-    return result
+    entries = [(n.created_at, n.id, _notification_entry(n)) for n in notifications]
+    for item in crud_notification.get_announcements_for_user(db, current_user, skip + limit, before):
+        a = item["announcement"]
+        entries.append((a.created_at, -a.id, _announcement_entry(a, item["is_read"])))
+    
+    entries.sort(key=lambda e: (e[0], e[1]), reverse=True)
+    page = entries[skip:skip + limit]
+    if len(page) == limit:
+        last_created_at, last_id, _ = page[-1]
+        set_next_cursor(response, encode_cursor(last_created_at, last_id))
+    return [entry for _, _, entry in page]
+
+@router.get("/unread-count")
+def get_unread_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Unread badge count: personal notifications plus announcements.
+    
+    Kept live over the WebSocket: {"type": "unread_count", "count": n} after
+    every new notification and read, and each "announcement" broadcast adds one.
+    """
+    return {"count": crud_notification.get_unread_count(db, current_user.id)}
+
+def _push_unread_count(background_tasks: BackgroundTasks, db: Session, user_id: int):
+    count = crud_notification.get_unread_count(db, user_id)
+    background_tasks.add_task(
+        manager.send_personal_message, crud_notification.unread_count_message(count), user_id
+    )
 
 @router.put("/{notification_id}/read")
 def mark_read(
     notification_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
+    # Negative ids are announcements (see get_notifications)
+    if notification_id < 0:
+        if not crud_notification.mark_announcement_read(db, current_user.id, -notification_id):
+            raise HTTPException(status_code=404, detail="Notification not found")
+        _push_unread_count(background_tasks, db, current_user.id)
+        return {"status": "success"}
+    
     notification = db.query(Notification).filter(
         Notification.id == notification_id,
         Notification.recipient_id == current_user.id
@@ -80,32 +160,43 @@ def mark_read(
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
         
-    notification.is_read = True
-    db.commit()
+    if not notification.is_read:
+        notification.is_read = True
+        db.commit()
+        _push_unread_count(background_tasks, db, current_user.id)
     return {"status": "success"}
 
 @router.put("/read-all")
 def mark_all_read(
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_user)
 ):
     db.query(Notification).filter(
         Notification.recipient_id == current_user.id,
-        Notification.is_read == False
-    ).update({"is_read": True})
+        Notification.is_read.isnot(True)
+    ).update({"is_read": True}, synchronize_session=False)
+    crud_notification.mark_all_announcements_read(db, current_user.id)
     db.commit()
+    background_tasks.add_task(
+        manager.send_personal_message, crud_notification.unread_count_message(0), current_user.id
+    )
     return {"status": "success"}
 
 @router.post("/announcement")
 async def create_announcement(
     title: str,
     message: str,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(deps.get_current_user)
 ):
     """
     Admin only: Create announcement for all users.
     For this prototype, we'll allow any logged in user or check a role if available.
+    
+    Stored once in `announcements`; recipients see it through get_notifications,
+    so the write cost doesn't depend on the number of users.
     """
     # Quick role check if role exists
     if hasattr(current_user, 'role') and current_user.role != 'admin':
@@ -114,33 +205,18 @@ async def create_announcement(
              # raise HTTPException(status_code=403, detail="Not authorized")
              pass 
 
-    # 1. Create notifications for ALL users (except sender)
-    # This can be heavy, for 1000s of users, use background task
-    users = db.query(User).filter(User.id != current_user.id).all()
-    
-    notifications = []
-    for user in users:
-        n = Notification(
-            recipient_id=user.id,
-            sender_id=current_user.id,
-            type="announcement",
-            title=title,
-            message=message,
-            reference_type="announcement",
-            created_at=datetime.utcnow()
-        )
-        notifications.append(n)
-    
-    db.add_all(notifications)
-    db.commit()
+    # 1. Store the announcement once for ALL users (except sender)
+    announcement = await crud_notification.create_announcement(db, current_user.id, title, message)
     
     # 2. Broadcast via WebSocket
-    await manager.broadcast({
+    background_tasks.add_task(manager.broadcast, {
         "type": "announcement",
+        "id": -announcement.id,
         "title": title,
         "message": message,
+        "sender_id": current_user.id,  # Not counted or listed for the sender
         "sender_name": current_user.full_name,
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": announcement.created_at.isoformat()
     })
     
-    return {"status": "sent", "count": len(users)}
+    return {"status": "sent", "announcement_id": announcement.id}
@@ -0,0 +1,63 @@
+"""
+Opaque keyset cursors.
+
+A cursor is the sort key of the last row a client has seen, JSON-encoded
+and base64url'd so clients treat it as an opaque token. Endpoints return
+the next cursor in the X-Next-Cursor response header, which keeps their
+list response bodies unchanged for existing clients.
+"""
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Any, List
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decode a cursor into its `size` key values, or raise 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def parse_cursor_datetime(value: Any) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_cursor_int(value: Any) -> int:
+    # bool is an int subclass, but never a valid key
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+
+def parse_cursor_float(value: Any) -> float:
+    # Whole floats come back from JSON as ints; json.loads also accepts NaN/Infinity
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return float(value)
+
+
+def set_next_cursor(response: Response, cursor: str | None) -> None:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
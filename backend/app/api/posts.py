@@ -1,27 +1,59 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query, Response
 from sqlalchemy.orm import Session, joinedload
 from app.db.session import get_db
 from app.api.auth import get_current_user
 from app.models.user import User
-from app.models.post import Post as PostModel
-from app.schemas.post import Post, PostCreate
+from app.models.post import Post as PostModel, PostTag
+from app.schemas.post import Post, PostCreate, PostSearchResult
 from app.crud import post as crud_post
 from app.core.socket_manager import manager
+from app.core.vote_buffer import vote_buffer
+from app.core.response_cache import feed_cache, CachedPage
+from app.core.autotag import auto_tagger
+from app.crud.vote import get_user_votes
 
 router = APIRouter()
 
 from app.api.auth import get_current_user # Keep for delete_post
-from app.api.deps import get_current_user_optional, get_current_admin
+from app.api.deps import get_current_user_optional, get_current_admin, rate_limit
+from app.db.search import SEARCH_CONFIG
+from app.api.pagination import encode_cursor, decode_cursor, parse_cursor_datetime, parse_cursor_float, parse_cursor_int, set_next_cursor
 
 # ... imports ...
 
 from datetime import datetime, timedelta
-from sqlalchemy import or_, desc, case, func
+from sqlalchemy import REAL, cast, func, select, tuple_
 import traceback
+import html
 
 # ...
 
+def _attach_user_votes(db: Session, posts: List[PostModel], current_user: Optional[User]):
+    """Fill user_vote for a whole page with one IN query."""
+    if not current_user or not posts:
+        return
+    votes = get_user_votes(db, current_user.id, "post", [p.id for p in posts])
+    for post in posts:
+        post.user_vote = votes.get(post.id)
+
+def _is_admin(current_user: Optional[User]) -> bool:
+    return bool(current_user and current_user.role == "admin")
+
+def _cache_page(key, posts: List[PostModel], next_cursor: Optional[str], generation: int) -> CachedPage:
+    """Serialize a redacted page once and cache it without per-user fields."""
+    rows = [Post.model_validate(post).model_dump(mode="json") for post in posts]
+    for row in rows:
+        row["user_vote"] = None
+    return feed_cache.put(key, rows, next_cursor, generation)
+
+def _page_response(db: Session, page: CachedPage, current_user: Optional[User]) -> Response:
+    """Cached page bytes plus the viewer's votes (one IN query, no Post rows loaded)."""
+    votes = get_user_votes(db, current_user.id, "post", page.ids) if current_user else {}
+    response = Response(content=page.render(votes), media_type="application/json")
+    set_next_cursor(response, page.next_cursor)
+    return response
+
 @router.get("/popular", response_model=List[Post])
 def get_popular_posts(
     timeframe: str = "today", # today, week, month, all
@@ -34,6 +66,12 @@ def get_popular_posts(
     Trending Engine: Surfacing the most engaging posts based on community interaction.
     Popularity = (Net Votes) + (Comments * 2) + (Shares * 3)
     """
+    cache_key = ("popular", timeframe, skip, limit, _is_admin(current_user))
+    page = feed_cache.get(cache_key)
+    if page:
+        return _page_response(db, page, current_user)
+    generation = feed_cache.generation
+    
     try:
         query = db.query(PostModel)
         
@@ -48,16 +86,15 @@ def get_popular_posts(
         elif timeframe == "month":
             query = query.filter(PostModel.created_at >= now - timedelta(days=30))
             
-        # Popularity Weighting Logic
-        popularity_score = (PostModel.upvotes - PostModel.downvotes) + \
-                          (PostModel.comments_count * 2) + \
-                          (PostModel.share_count * 3)
-        
+        # Popularity is materialized in posts.popularity_score (see crud.post.bump_popularity),
+        # so this is an ordered scan on ix_posts_popularity_score_created_at plus LIMIT.
         # We sort by popularity_score DESC, with Recency as tie-breaker
         posts = query.options(joinedload(PostModel.author))\
-            .order_by(desc(popularity_score), PostModel.created_at.desc())\
+            .order_by(PostModel.popularity_score.desc(), PostModel.created_at.desc())\
             .offset(skip).limit(limit).all()
             
+        vote_buffer.merge_into("post", posts)
+            
         # Redaction for anonymous posts
         for post in posts:
             if post.is_anonymous:
@@ -65,64 +102,199 @@ def get_popular_posts(
                     post.author = None
                     post.author_id = None
                     
-        return posts
+        page = _cache_page(cache_key, posts, None, generation)
+        return _page_response(db, page, current_user)
         
     except Exception as e:
         print(f"ERROR in get_popular_posts: {e}")
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/search", response_model=List[PostSearchResult])
+def search_posts(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    department: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Full-text search over post titles, content and comments.
+    
+    `q` takes web-search syntax ("exact phrase", -exclude, or). Results are
+    ranked (title > content > comments) with a highlighted headline; more
+    results: pass X-Next-Cursor back as `cursor`.
+    """
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(PostModel.search_vector, ts_query)
+    
+    # Rank and page on the GIN index first; headlines only for the page
+    matches = select(PostModel.id.label("id"), rank.label("rank"))\
+        .where(PostModel.search_vector.op("@@")(ts_query))
+    if department and department != 'ALL':
+        matches = matches.where(PostModel.department == department)
+    if cursor:
+        after_rank, after_id = decode_cursor(cursor, 2)
+        # ts_rank_cd is real; the cursor holds its shortest decimal form, which only
+        # compares equal to the original once cast back (else the last row repeats)
+        after = (cast(parse_cursor_float(after_rank), REAL), parse_cursor_int(after_id))
+        matches = matches.where(tuple_(rank, PostModel.id) < tuple_(*after))
+    page = matches.order_by(rank.desc(), PostModel.id.desc()).limit(limit).subquery()
+    
+    headline = func.ts_headline(
+        SEARCH_CONFIG, PostModel.content, ts_query,
+        f'StartSel="{_HIGHLIGHT_START}", StopSel="{_HIGHLIGHT_STOP}", MaxWords=35, MinWords=15'
+    )
+    rows = db.query(PostModel, page.c.rank, headline)\
+        .join(page, PostModel.id == page.c.id)\
+        .options(joinedload(PostModel.author))\
+        .order_by(page.c.rank.desc(), PostModel.id.desc())\
+        .all()
+    
+    posts = [post for post, _, _ in rows]
+    if len(rows) == limit:
+        _, last_rank, _ = rows[-1]
+        set_next_cursor(response, encode_cursor(last_rank, posts[-1].id))
+    
+    vote_buffer.merge_into("post", posts)
+    _attach_user_votes(db, posts, current_user)
+    
+    results = []
+    for post, post_rank, post_headline in rows:
+        if post.is_anonymous and not _is_admin(current_user):
+            post.author = None
+            post.author_id = None
+        result = Post.model_validate(post).model_dump()
+        result.update(rank=post_rank, headline=_highlight_html(post_headline))
+        results.append(result)
+    return results
+
+# ts_headline works on raw content; mark matches with control characters, escape, then add the tags
+_HIGHLIGHT_START, _HIGHLIGHT_STOP = "\x02", "\x03"
+
+def _highlight_html(fragment: str) -> str:
+    """HTML-escaped headline fragment with matches wrapped in <mark></mark>."""
+    return html.escape(fragment or "")\
+        .replace(_HIGHLIGHT_START, "<mark>")\
+        .replace(_HIGHLIGHT_STOP, "</mark>")
+
+def _is_effectively_pinned(post: PostModel) -> bool:
+    return bool(post.is_pinned) and (post.pinned_until is None or post.pinned_until > datetime.utcnow())
+
 @router.get("/", response_model=List[Post])
 def read_posts(
     skip: int = 0, 
     limit: int = 100, 
     department: Optional[str] = None,
     tags: Optional[str] = None,
+    tag_match: str = Query("any", pattern="^(any|all)$"),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
+    """
+    Main feed: effectively pinned posts first, then newest first.
+    
+    Two paging modes:
+    - skip/limit (legacy): OFFSET paging, cost grows with depth
+    - cursor: keyset paging from the X-Next-Cursor header of the previous page,
+      constant cost at any depth. `skip` is ignored when a cursor is given.
+    
+    `tags` is one tag or a comma-separated list (case-insensitive, whole tags);
+    tag_match=any returns posts with at least one of them, all posts with every one.
+    
+    Pages are served from feed_cache, shared by all logged-out and non-admin viewers.
+    """
+    cache_key = ("feed", department, tuple(crud_post.parse_tags(tags)), tag_match, cursor, skip, limit, _is_admin(current_user))
+    page = feed_cache.get(cache_key)
+    if page:
+        return _page_response(db, page, current_user)
+    generation = feed_cache.generation
+    
     try:
         query = db.query(PostModel)
         
         if department and department != 'ALL':
             query = query.filter(PostModel.department == department)
             
-        if tags:
-            query = query.filter(PostModel.tags.ilike(f"%{tags}%"))
+        tag_keys = crud_post.parse_tags(tags)
+        if tag_keys:
+            # Index lookups on post_tags (ix_post_tags_tag_post_id). "all" is one
+            # semi-join per tag rather than GROUP BY/HAVING, which would aggregate
+            # every tagged post before the feed's LIMIT applies.
+            if tag_match == "all":
+                for tag in tag_keys:
+                    query = query.filter(PostModel.id.in_(select(PostTag.post_id).where(PostTag.tag == tag)))
+            else:
+                query = query.filter(PostModel.id.in_(select(PostTag.post_id).where(PostTag.tag.in_(tag_keys))))
             
         # Temporal Pinning Logic:
         # A post is "effectively pinned" if is_pinned=True AND (pinned_until IS NULL OR pinned_until > now)
         # using func.now() avoids python/db timezone mismatches
         db_now = func.now()
+        pinned_filter = (PostModel.is_pinned.is_(True)) & \
+            ((PostModel.pinned_until == None) | (PostModel.pinned_until > db_now))
+        regular_filter = (PostModel.is_pinned.isnot(True)) | \
+            ((PostModel.pinned_until != None) & (PostModel.pinned_until <= db_now))
+        
+        query = query.options(joinedload(PostModel.author))
+        keyset_order = (PostModel.created_at.desc(), PostModel.id.desc())
         
-        # Create a custom sort expression (1 for pinned, 0 for regular)
-        is_effectively_pinned = case(
-            (
-                (PostModel.is_pinned == True) & 
-                ((PostModel.pinned_until == None) | (PostModel.pinned_until > db_now)), 
-                1
-            ),
-            else_=0
-        )
+        if cursor:
+            # Keyset paging: walk the pinned section, then the regular section,
+            # each as a (created_at, id) range scan on ix_posts_created_at_id.
+            pinned, created_at, post_id = decode_cursor(cursor, 3)
+            if parse_cursor_int(pinned) not in (0, 1):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            after_cursor = tuple_(PostModel.created_at, PostModel.id) < \
+                tuple_(parse_cursor_datetime(created_at), parse_cursor_int(post_id))
+            
+            posts = []
+            if pinned:
+                posts = query.filter(pinned_filter, after_cursor)\
+                    .order_by(*keyset_order).limit(limit).all()
+                if len(posts) < limit:
+                    posts += query.filter(regular_filter)\
+                        .order_by(*keyset_order).limit(limit - len(posts)).all()
+            else:
+                posts = query.filter(regular_filter, after_cursor)\
+                    .order_by(*keyset_order).limit(limit).all()
+        else:
+            # Same two sections as keyset paging: sorting by a now()-dependent
+            # "is pinned" expression can't use an index and sorts the whole table.
+            # Pinned posts come from ix_posts_pinned_created_at_id.
+            posts = query.filter(pinned_filter)\
+                .order_by(*keyset_order).offset(skip).limit(limit).all()
+            if len(posts) < limit:
+                pinned_total = skip + len(posts) if posts or not skip else \
+                    query.filter(pinned_filter).with_entities(func.count(PostModel.id)).scalar()
+                posts += query.filter(regular_filter)\
+                    .order_by(*keyset_order).offset(max(skip - pinned_total, 0))\
+                    .limit(limit - len(posts)).all()
+        
+        next_cursor = None
+        if posts and len(posts) == limit:
+            last = posts[-1]
+            next_cursor = encode_cursor(
+                1 if _is_effectively_pinned(last) else 0, last.created_at, last.id
+            )
 
-        # Order by Effective Pin first, then Created At
-        posts = query.options(joinedload(PostModel.author))\
-            .order_by(desc(is_effectively_pinned), PostModel.created_at.desc())\
-            .offset(skip).limit(limit).all()
+        vote_buffer.merge_into("post", posts)
 
         # Redaction Logic
-        # For python-side comparison, we ideally need timezone aware if DB is aware.
-        # But for UI logic, we can just skip the expired cleanup visualization for now if it's complex,
-        # or safely handle it.
-        now = datetime.utcnow()
         for post in posts:
             if post.is_anonymous:
                 if not current_user or current_user.role != "admin":
                    post.author = None
                    post.author_id = None
         
-        return posts
+        page = _cache_page(cache_key, posts, next_cursor, generation)
+        return _page_response(db, page, current_user)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"ERROR in read_posts: {e}")
         traceback.print_exc()
@@ -158,6 +330,7 @@ def unpin_post(
     
     db.commit()
     db.refresh(post)
+    feed_cache.invalidate()
     return post
 
 @router.post("/", response_model=Post, status_code=status.HTTP_201_CREATED)
@@ -167,30 +340,11 @@ def create_post(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # Ensure current_user is valid (it should be due to Depends)
-    # Auto-tagging logic
-    content_lower = (post.title + " " + post.content).lower()
-    
-    academic_keywords = ['exam', 'syllabus', 'deadline', 'assignment', 'lecture', 'professor', 'quiz', 'lab', 'viva']
-    event_keywords = ['fest', 'hackathon', 'workshop', 'register', 'ticket', 'club', 'party', 'seminar', 'webinar']
-    
-    auto_tags = []
-    if any(k in content_lower for k in academic_keywords):
-        auto_tags.append("Academic")
-    if any(k in content_lower for k in event_keywords):
-        auto_tags.append("Event")
-        
-    if auto_tags:
-        current_tags = post.tags.split(',') if post.tags else []
-        # Filter empty strings and strip whitespace
-        current_tags = [t.strip() for t in current_tags if t.strip()]
-        # Add new unique tags
-        for t in auto_tags:
-            if t not in current_tags:
-                current_tags.append(t)
-        post.tags = ",".join(current_tags)
+    # Auto-tagging: one pass of the compiled taxonomy over title + content
+    post.tags = auto_tagger.apply(post.tags, post.title + " " + post.content)
 
     new_post = crud_post.create_post(db=db, post=post, author_id=current_user.id)
+    feed_cache.invalidate()
     
     # Broadcast new post
     # Create a simple representation for broadcast
@@ -238,6 +392,9 @@ def read_post(
     db_post = crud_post.get_post(db, post_id=post_id)
     if db_post is None:
         raise HTTPException(status_code=404, detail="Post not found")
+    
+    vote_buffer.merge_into("post", [db_post])
+    _attach_user_votes(db, [db_post], current_user)
         
     if db_post.is_anonymous:
         if not current_user or current_user.role != "admin":
@@ -276,40 +433,24 @@ def delete_post(
              db.add(log)
         
     crud_post.delete_post(db=db, post_id=post_id)
+    feed_cache.invalidate()
     return None
 
-# Simple in-memory rate limiting for shares (5 per minute per user)
-from collections import defaultdict
-import time
-
-share_rate_limits: dict = defaultdict(list)
-
-@router.patch("/{post_id}/share", status_code=status.HTTP_200_OK)
+@router.patch(
+    "/{post_id}/share",
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(rate_limit(
+        "share", 5, 60, detail="Too many shares. Please wait a minute before sharing again."
+    ))]
+)
 def increment_share_count(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    db: Session = Depends(get_db)
 ):
     """
     Smart Share: Increment share count with rate limiting.
-    Max 5 shares per user per minute to prevent spam.
+    Max 5 shares per user (or IP, when anonymous) per minute to prevent spam.
     """
-    # Rate limiting check
-    user_key = str(current_user.id) if current_user else "anonymous"
-    current_time = time.time()
-    
-    # Clean old entries (older than 60 seconds)
-    share_rate_limits[user_key] = [
-        t for t in share_rate_limits[user_key] if current_time - t < 60
-    ]
-    
-    # Check limit (5 per minute)
-    if len(share_rate_limits[user_key]) >= 5:
-        raise HTTPException(
-            status_code=429, 
-            detail="Too many shares. Please wait a minute before sharing again."
-        )
-    
     # Find post
     post = crud_post.get_post(db, post_id)
     if not post:
@@ -317,12 +458,10 @@ def increment_share_count(
     
     # Increment share count
     post.share_count = (post.share_count or 0) + 1
+    crud_post.bump_popularity(post, crud_post.SHARE_WEIGHT)
     db.commit()
     db.refresh(post)
     
-    # Record this share for rate limiting
-    share_rate_limits[user_key].append(current_time)
-    
     return {"share_count": post.share_count, "message": "Share counted!"}
 
 @router.put("/{post_id}/pin", response_model=Post)
@@ -363,4 +502,5 @@ def pin_post(
     
     db.commit()
     db.refresh(post)
+    feed_cache.invalidate()
     return post
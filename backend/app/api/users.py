@@ -4,6 +4,7 @@ from app.db.session import get_db
 from app.models.user import User
 from app.schemas.user import UserBasic, UserBase, UserUpdate
 from app.api.deps import get_current_user
+from app.core.auth_cache import principal_cache
 from pydantic import BaseModel
 from typing import Optional
 
@@ -21,6 +22,11 @@ def update_user_me(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    # current_user may be a cached snapshot; edit the live row
+    current_user = db.query(User).filter(User.id == current_user.id).first()
+    if not current_user:
+        raise HTTPException(status_code=404, detail="User not found")
+
     # Update fields if provided
     if user_update.full_name is not None:
         current_user.full_name = user_update.full_name
@@ -40,6 +46,7 @@ def update_user_me(
         
     db.commit()
     db.refresh(current_user)
+    principal_cache.invalidate_user(current_user.id)
     return current_user
 
 @router.get("/{username}", response_model=UserBasic)
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.vote import Vote, VoteType
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.models.user import User
-from app.models.post import Post
-from app.models.comment import Comment
 from app.api.deps import get_current_user
+from app.crud.vote import apply_vote
+from app.crud import notification as crud_notification
+from app.core.vote_buffer import vote_buffer
+from app.core.notification_push import notification_pusher
 from pydantic import BaseModel
 from typing import Optional
 
@@ -16,19 +17,10 @@ class VoteRequest(BaseModel):
     comment_id: Optional[int] = None
     vote_type: int # 1 or -1
 
-from starlette.background import BackgroundTasks
-from app.models.notification import Notification
-from app.core.socket_manager import manager
-from datetime import datetime
-
-async def send_vote_notification(user_id: int, message: dict):
-    await manager.send_personal_message(message, user_id)
-
 @router.post("/")
 async def cast_vote(
     vote_data: VoteRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     # Validation
@@ -41,100 +33,47 @@ async def cast_vote(
     if vote_data.vote_type not in [1, -1]:
         raise HTTPException(status_code=400, detail="Invalid vote type. Use 1 for upvote, -1 for downvote")
 
-    # Check existence
-    model = Post if vote_data.post_id else Comment
-    target_id = vote_data.post_id if vote_data.post_id else vote_data.comment_id
-    
-    target = db.query(model).filter(model.id == target_id).first()
-    if not target:
+    result = await apply_vote(
+        db,
+        user_id=current_user.id,
+        vote_type=vote_data.vote_type,
+        post_id=vote_data.post_id,
+        comment_id=vote_data.comment_id,
+        defer_counters=vote_buffer.enabled
+    )
+    if result is None:
         raise HTTPException(status_code=404, detail="Target not found")
 
-    # Check existing vote
-    existing_vote = db.query(Vote).filter(
-        Vote.user_id == current_user.id,
-        Vote.post_id == vote_data.post_id,
-        Vote.comment_id == vote_data.comment_id
-    ).first()
-
-    if existing_vote:
-        if existing_vote.vote_type == vote_data.vote_type:
-            # Remove vote (toggle off)
-            db.delete(existing_vote)
-            
-            # Update cache
-            if vote_data.vote_type == 1:
-                target.upvotes -= 1
-            else:
-                target.downvotes -= 1
-                
-            db.commit()
-            return {"status": "removed", "upvotes": target.upvotes, "downvotes": target.downvotes}
-        else:
-            # Switch vote
-            old_type = existing_vote.vote_type
-            existing_vote.vote_type = vote_data.vote_type
-            
-            # Update cache
-            if old_type == 1:
-                target.upvotes -= 1
-                target.downvotes += 1
-            else:
-                target.downvotes -= 1
-                target.upvotes += 1
-            
-            db.commit()
-            return {"status": "switched", "upvotes": target.upvotes, "downvotes": target.downvotes}
-    else:
-        # Create new vote
-        new_vote = Vote(
-            user_id=current_user.id,
-            post_id=vote_data.post_id,
-            comment_id=vote_data.comment_id,
-            vote_type=vote_data.vote_type
+    message = None
+    
+    # Notify Author (new upvote on a Post, not self); aggregated per post and window
+    if result["status"] == "added" and vote_data.vote_type == 1 and vote_data.post_id \
+            and result["author_id"] and result["author_id"] != current_user.id:
+        message = await crud_notification.add_event(
+            db,
+            recipient_id=result["author_id"],
+            sender=current_user,
+            type="upvote",
+            title="New Upvote",
+            action="upvoted your post",
+            reference_id=vote_data.post_id,
         )
-        db.add(new_vote)
-        
-        # Update cache
-        if vote_data.vote_type == 1:
-            target.upvotes += 1
-            
-            # Notify Author (if Post and not self)
-            if vote_data.post_id and model == Post and target.author_id != current_user.id:
-                # Check for existing notification to prevent spam
-                existing = db.query(Notification).filter(
-                    Notification.recipient_id == target.author_id,
-                    Notification.sender_id == current_user.id,
-                    Notification.type == "upvote",
-                    Notification.reference_id == target.id
-                ).first()
-                
-                if not existing:
-                    notif = Notification(
-                        recipient_id=target.author_id,
-                        sender_id=current_user.id,
-                        type="upvote",
-                        title="New Upvote",
-                        message=f"{current_user.full_name} upvoted your post",
-                        reference_id=target.id,
-                        reference_type="post",
-                        created_at=datetime.utcnow()
-                    )
-                    db.add(notif)
-                    # We commit at end, so it's fine.
-                    
-                    background_tasks.add_task(send_vote_notification, target.author_id, {
-                        "type": "upvote",
-                        "title": "New Upvote",
-                        "message": f"{current_user.full_name} upvoted your post",
-                        "reference_id": target.id,
-                        "sender": {
-                            "name": current_user.full_name
-                        },
-                        "created_at": datetime.utcnow().isoformat()
-                    })
 
-        else:
-            target.downvotes += 1
-            
-        db.commit()
-        return {"status": "added", "upvotes": target.upvotes, "downvotes": target.downvotes}
+    await db.commit()
+    
+    if message:
+        count = await crud_notification.get_unread_count_async(db, result["author_id"])
+        notification_pusher.queue(result["author_id"], message)
+        notification_pusher.queue(result["author_id"], crud_notification.unread_count_message(count))
+    
+    upvotes, downvotes = result["upvotes"], result["downvotes"]
+    if vote_buffer.enabled:
+        # Counters are written behind: report stored + pending + this vote
+        target_type = "post" if vote_data.post_id else "comment"
+        target_id = vote_data.post_id or vote_data.comment_id
+        pending_up, pending_down = vote_buffer.pending(target_type, target_id)
+        vote_buffer.add(target_type, target_id, result["up_delta"], result["down_delta"])
+        upvotes += pending_up + result["up_delta"]
+        downvotes += pending_down + result["down_delta"]
+    
+    return {"status": result["status"], "upvotes": upvotes, "downvotes": downvotes}
@@ -0,0 +1,123 @@
+"""
+Authenticated-principal cache.
+
+Maps a bearer token (by SHA-256 hash, never the raw token) to its verified
+claims and a snapshot of the User row, so repeat requests skip both the
+JWT/Firebase verification and the user lookup.
+
+Entries expire at the earlier of the configured TTL and the token's own
+`exp`, and are dropped whenever the user's profile changes.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.core.pubsub import bus
+from app.models.user import User
+
+
+class _Entry:
+    __slots__ = ("user_id", "claims", "snapshot", "expires_at")
+
+    def __init__(self, user_id: int, claims: dict, snapshot: dict, expires_at: float):
+        self.user_id = user_id
+        self.claims = claims
+        self.snapshot = snapshot
+        self.expires_at = expires_at
+
+
+class PrincipalCache:
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_user: Dict[int, Set[str]] = {}
+        # Sync dependencies run in the threadpool
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[User]:
+        """Return a fresh detached User for a cached token, or None."""
+        if self.ttl_seconds <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            snapshot = entry.snapshot
+
+        # New instance per request so handlers never share mutable state.
+        # Detached (not transient): attaching it to a session won't INSERT.
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, token: str, claims: dict, user: User) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= time.time():
+            return
+
+        snapshot = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        key = self._key(token)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(user.id, dict(claims), snapshot, expires_at)
+            self._by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry.user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry.user_id]
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token for a user on this worker and tell the others."""
+        self._invalidate_local(user_id)
+        bus.publish_threadsafe("auth", {"user_id": user_id})
+
+    def _invalidate_local(self, user_id: int) -> None:
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._drop(key)
+
+    async def on_invalidate(self, payload: dict) -> None:
+        """Bus subscriber for invalidations published by other workers."""
+        self._invalidate_local(payload["user_id"])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+)
+bus.subscribe("auth", principal_cache.on_invalidate)
@@ -0,0 +1,63 @@
+"""
+Keyword auto-tagger for new posts.
+
+The taxonomy ({tag: [keywords]}) is compiled once into a single regex: one
+named group per tag, keywords as word-bounded alternatives. Tagging a post is
+then one left-to-right pass over its text, however many tags and keywords
+there are, and only whole words match ("lab" no longer matches "available").
+A keyword also matches its plural ("exams", "workshops").
+
+Override the default taxonomy with AUTO_TAG_TAXONOMY, e.g.
+AUTO_TAG_TAXONOMY='{"Placement": ["internship", "interview", "placement"]}'
+"""
+import re
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+
+DEFAULT_TAXONOMY: Dict[str, List[str]] = {
+    "Academic": ["exam", "syllabus", "deadline", "assignment", "lecture", "professor", "quiz", "lab", "viva"],
+    "Event": ["fest", "hackathon", "workshop", "register", "ticket", "club", "party", "seminar", "webinar"],
+}
+
+
+class AutoTagger:
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.tags = [tag for tag, keywords in taxonomy.items() if keywords]
+        # Longest first, so a keyword that prefixes another never wins the alternation
+        self.keywords: Dict[str, List[str]] = {
+            tag: sorted({k.strip().lower() for k in taxonomy[tag] if k.strip()}, key=len, reverse=True)
+            for tag in self.tags
+        }
+        groups = []
+        for i, tag in enumerate(self.tags):
+            keywords = self.keywords[tag]
+            groups.append(f"(?P<t{i}>{'|'.join(re.escape(k) for k in keywords)})")
+        self._pattern = re.compile(
+            r"\b(?:" + "|".join(groups) + r")(?:e?s)?\b", re.IGNORECASE
+        ) if groups else None
+
+    def match(self, text: str) -> List[str]:
+        """Tags whose keywords occur in `text`, in taxonomy order."""
+        if self._pattern is None or not text:
+            return []
+        found = set()
+        for m in self._pattern.finditer(text):
+            found.add(int(m.lastgroup[1:]))
+            if len(found) == len(self.tags):
+                break
+        return [self.tags[i] for i in sorted(found)]
+
+    def apply(self, tags: Optional[str], text: str) -> Optional[str]:
+        """Merge matched tags into a comma-separated tags string (unchanged if none match)."""
+        matched = self.match(text)
+        if not matched:
+            return tags
+        current = [t.strip() for t in (tags or "").split(",") if t.strip()]
+        for tag in matched:
+            if tag not in current:
+                current.append(tag)
+        return ",".join(current)
+
+
+auto_tagger = AutoTagger(settings.AUTO_TAG_TAXONOMY or DEFAULT_TAXONOMY)
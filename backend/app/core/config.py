@@ -1,3 +1,4 @@
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -23,6 +24,48 @@ class Settings(BaseSettings):
         
         return url
 
+    # Connection pools are sized from a deployment-wide budget shared by all workers.
+    # WEB_CONCURRENCY is also what gunicorn reads for its worker count.
+    WEB_CONCURRENCY: int = 4
+    DB_MAX_CONNECTIONS: int = 40
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # Recycle connections before server/proxy idle timeouts instead of pinging on every checkout
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = False
+
+    # Authenticated-principal cache (0 disables); entries never outlive the token's exp
+    AUTH_CACHE_TTL_SECONDS: int = 300
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Write-behind vote counters for hot posts (Vote rows are always written immediately)
+    VOTE_WRITE_BEHIND: bool = False
+    VOTE_FLUSH_INTERVAL_SECONDS: float = 1.0
+    VOTE_FLUSH_THRESHOLD: int = 500
+
+    # Feed/trending response cache (0 disables); also the staleness budget for counters
+    FEED_CACHE_TTL_SECONDS: float = 5.0
+    FEED_CACHE_MAX_ENTRIES: int = 1000
+
+    # Auto-tagging taxonomy {tag: [keywords]} as JSON; unset uses app.core.autotag.DEFAULT_TAXONOMY
+    AUTO_TAG_TAXONOMY: Optional[Dict[str, List[str]]] = None
+
+    # Notifications: same-type events on the same target within a window share one row
+    NOTIFICATION_AGGREGATION_WINDOW_SECONDS: int = 3600
+    # WebSocket notification pushes are coalesced per user over this interval
+    NOTIFICATION_PUSH_INTERVAL_SECONDS: float = 0.5
+
+    # Notification retention (scripts/notification_retention.py): read notifications older than
+    # RETENTION_DAYS and any older than UNREAD_RETENTION_DAYS move to notifications_archive;
+    # archived rows are deleted after ARCHIVE_RETENTION_DAYS (0 keeps them forever)
+    NOTIFICATION_RETENTION_DAYS: int = 90
+    NOTIFICATION_UNREAD_RETENTION_DAYS: int = 365
+    NOTIFICATION_ARCHIVE_RETENTION_DAYS: int = 730
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = 5000
+
+    # Rate limiting: "memory" (per worker) or "postgres" (rate_limits table, shared by all workers)
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 10000  # Memory backend: least recently seen keys are evicted beyond this
+
     # Production Frontend URL for CORS
     FRONTEND_URL: str = "http://localhost:3000"
     
@@ -39,6 +82,12 @@ class Settings(BaseSettings):
     # Firebase
     FIREBASE_CREDENTIALS_JSON: str | None = None
 
+    # Real-time fan-out across gunicorn workers: "memory" (single worker) or "postgres" (LISTEN/NOTIFY)
+    REALTIME_BACKEND: str = "memory"
+    # Per-socket delivery limits: slower or more backed-up sockets are evicted
+    WS_SEND_TIMEOUT_SECONDS: float = 5.0
+    WS_OUTBOUND_QUEUE_SIZE: int = 64
+
     class Config:
         case_sensitive = True
         env_file = ".env"
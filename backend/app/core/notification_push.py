@@ -0,0 +1,68 @@
+"""
+Coalesced WebSocket delivery for notifications.
+
+Producers queue messages instead of pushing them one by one. Per user,
+messages with the same key replace each other (an aggregated notification
+is keyed by its row id, the badge by "unread_count"), and everything pending
+is sent every NOTIFICATION_PUSH_INTERVAL_SECONDS. A burst of 50 upvotes on
+one post becomes one notification push and one badge push per interval.
+
+Only used from the event loop (async routes), so no locking is needed.
+"""
+import asyncio
+import logging
+from typing import Dict, Hashable, Optional
+
+from app.core.config import settings
+from app.core.socket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationPusher:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._pending: Dict[int, Dict[Hashable, dict]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def queue(self, user_id: int, message: dict) -> None:
+        """Queue a message for a user; a pending message with the same key is replaced."""
+        key = message["id"] if "id" in message else message["type"]
+        if self._task is None:
+            # Not started (interval 0 or no lifespan): send right away
+            asyncio.get_running_loop().create_task(manager.send_personal_message(message, user_id))
+            return
+        messages = self._pending.setdefault(user_id, {})
+        messages.pop(key, None)  # Re-insert so delivery order follows the latest update
+        messages[key] = message
+
+    async def flush(self) -> None:
+        batch, self._pending = self._pending, {}
+        for user_id, messages in batch.items():
+            for message in messages.values():
+                try:
+                    await manager.send_personal_message(message, user_id)
+                except Exception as e:
+                    logger.error(f"Notification push to user {user_id} failed: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+notification_pusher = NotificationPusher(settings.NOTIFICATION_PUSH_INTERVAL_SECONDS)
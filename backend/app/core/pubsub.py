@@ -0,0 +1,261 @@
+"""
+Cross-worker publish/subscribe bus.
+
+Production runs several gunicorn workers, each with its own in-memory state
+(WebSocket connections, caches). Anything that has to reach every worker is
+published here once and delivered to the subscribers of every worker.
+
+Backends:
+- memory:   in-process delivery only (single worker / local development)
+- postgres: LISTEN/NOTIFY on the application database, no extra service needed.
+            Payloads too large for NOTIFY go through the pubsub_spill table
+            and only their row id is notified.
+"""
+import asyncio
+import json
+import logging
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Awaitable[None]]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+# Spilled payloads only need to outlive delivery to every listening worker
+SPILL_RETENTION = "5 minutes"
+
+
+class PubSubBackend:
+    """Transport interface. `start` registers the callback for incoming messages."""
+
+    async def start(self, on_message: Handler) -> None:
+        raise NotImplementedError
+
+    async def publish(self, message: dict) -> None:
+        raise NotImplementedError
+
+    async def stop(self) -> None:
+        pass
+
+
+class MemoryBackend(PubSubBackend):
+    """Delivers straight back to this process. Default when nothing else is configured."""
+
+    def __init__(self):
+        self._on_message: Optional[Handler] = None
+
+    async def start(self, on_message: Handler) -> None:
+        self._on_message = on_message
+
+    async def publish(self, message: dict) -> None:
+        if self._on_message:
+            await self._on_message(message)
+
+
+class PostgresBackend(PubSubBackend):
+    """
+    LISTEN/NOTIFY transport.
+
+    Every worker LISTENs on the same channel, so a NOTIFY from one worker
+    (including itself) reaches all of them. The listening connection is
+    polled from the event loop via add_reader; publishing happens on a
+    second connection in a worker thread so the loop never blocks.
+
+    Oversized messages are written to pubsub_spill and announced as
+    {"spill": id}; every receiver reads the row back. They may therefore
+    arrive after smaller messages published later.
+    """
+
+    def __init__(self, dsn: str, channel: str = "loopin_events"):
+        self.dsn = dsn
+        self.channel = channel
+        self._on_message: Optional[Handler] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listen_conn = None
+        self._listen_fd: Optional[int] = None  # fileno() raises once the connection is broken
+        self._publish_conn = None
+        self._publish_lock = threading.Lock()
+
+    def _connect(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        conn = psycopg2.connect(self.dsn)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
+
+    async def start(self, on_message: Handler) -> None:
+        self._on_message = on_message
+        self._loop = asyncio.get_running_loop()
+        await self._listen()
+        self._publish_conn = await asyncio.to_thread(self._connect)
+
+    async def _listen(self) -> None:
+        self._listen_conn = await asyncio.to_thread(self._connect)
+        with self._listen_conn.cursor() as cur:
+            cur.execute(f'LISTEN "{self.channel}"')
+        self._listen_fd = self._listen_conn.fileno()
+        self._loop.add_reader(self._listen_fd, self._on_readable)
+
+    def _drop_listener(self) -> None:
+        if self._listen_fd is not None:
+            self._loop.remove_reader(self._listen_fd)
+            self._listen_fd = None
+        if self._listen_conn is not None:
+            try:
+                self._listen_conn.close()
+            except Exception:
+                pass
+
+    def _on_readable(self) -> None:
+        try:
+            self._listen_conn.poll()
+        except Exception as e:
+            logger.error(f"Pub/sub listener connection lost: {e}")
+            self._drop_listener()
+            self._loop.create_task(self._relisten())
+            return
+
+        while self._listen_conn.notifies:
+            notify = self._listen_conn.notifies.pop(0)
+            try:
+                message = json.loads(notify.payload)
+            except ValueError:
+                logger.warning("Dropping malformed pub/sub payload")
+                continue
+            if "spill" in message:
+                self._loop.create_task(self._deliver_spilled(message["spill"]))
+            else:
+                self._loop.create_task(self._on_message(message))
+
+    async def _deliver_spilled(self, spill_id: int) -> None:
+        try:
+            payload = await asyncio.to_thread(
+                self._execute, "SELECT payload FROM pubsub_spill WHERE id = %s", (spill_id,)
+            )
+        except Exception as e:
+            logger.error(f"Pub/sub could not read spilled payload {spill_id}: {e}")
+            return
+        if payload is None:
+            logger.warning(f"Pub/sub spilled payload {spill_id} already purged")
+            return
+        await self._on_message(json.loads(payload))
+
+    async def _relisten(self) -> None:
+        delay = 1
+        while True:
+            try:
+                await self._listen()
+                logger.info("Pub/sub listener reconnected")
+                return
+            except Exception as e:
+                logger.error(f"Pub/sub reconnect failed, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    def _execute(self, sql: str, params: tuple):
+        """Run one statement on the publish connection; returns the first column of the first row."""
+        with self._publish_lock:
+            try:
+                return self._run(sql, params)
+            except Exception:
+                # Stale connection: reconnect once and retry
+                self._publish_conn = self._connect()
+                return self._run(sql, params)
+
+    def _run(self, sql: str, params: tuple):
+        with self._publish_conn.cursor() as cur:
+            cur.execute(sql, params)
+            row = cur.fetchone() if cur.description else None
+            return row[0] if row else None
+
+    def _spill(self, payload: str) -> int:
+        self._execute(f"DELETE FROM pubsub_spill WHERE created_at < now() - interval '{SPILL_RETENTION}'", ())
+        return self._execute("INSERT INTO pubsub_spill (payload) VALUES (%s) RETURNING id", (payload,))
+
+    async def publish(self, message: dict) -> None:
+        payload = json.dumps(message, default=str)
+        if len(payload.encode("utf-8")) >= NOTIFY_PAYLOAD_LIMIT:
+            spill_id = await asyncio.to_thread(self._spill, payload)
+            payload = json.dumps({"spill": spill_id})
+        await asyncio.to_thread(self._execute, "SELECT pg_notify(%s, %s)", (self.channel, payload))
+
+    async def stop(self) -> None:
+        self._drop_listener()
+        if self._publish_conn is not None:
+            self._publish_conn.close()
+
+
+class Bus:
+    """
+    Topic router on top of a backend.
+
+    Usage:
+        bus.subscribe("ws", handler)      # at import time
+        await bus.publish("ws", {...})    # from any request
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Handler]] = {}
+        self._backend: PubSubBackend = MemoryBackend()
+        self._backend_started = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        self._subscribers.setdefault(topic, []).append(handler)
+
+    async def _dispatch(self, envelope: dict) -> None:
+        for handler in self._subscribers.get(envelope.get("topic"), []):
+            try:
+                await handler(envelope.get("payload"))
+            except Exception as e:
+                logger.error(f"Pub/sub handler for '{envelope.get('topic')}' failed: {e}")
+
+    async def start(self, backend: PubSubBackend) -> None:
+        self._loop = asyncio.get_running_loop()
+        try:
+            await backend.start(self._dispatch)
+            self._backend = backend
+        except Exception as e:
+            logger.error(f"Pub/sub backend failed to start, falling back to in-process delivery: {e}")
+            self._backend = MemoryBackend()
+            await self._backend.start(self._dispatch)
+        self._backend_started = True
+
+    async def stop(self) -> None:
+        await self._backend.stop()
+        self._backend = MemoryBackend()
+        self._backend_started = False
+        self._loop = None
+
+    async def publish(self, topic: str, payload: dict) -> None:
+        if not self._backend_started:
+            # Not started (scripts, tests): deliver in-process
+            await self._dispatch({"topic": topic, "payload": payload})
+            return
+        await self._backend.publish({"topic": topic, "payload": payload})
+
+    def publish_threadsafe(self, topic: str, payload: dict) -> None:
+        """
+        Fire-and-forget publish from sync code (threadpool routes).
+
+        No-op until the bus is started; callers apply their local effect
+        themselves, so only the other workers depend on this.
+        """
+        if self._loop is None or self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.publish(topic, payload), self._loop)
+
+
+def create_backend(name: str, database_url: str) -> PubSubBackend:
+    if name == "postgres":
+        return PostgresBackend(database_url)
+    if name != "memory":
+        logger.warning(f"Unknown REALTIME_BACKEND '{name}', using in-process delivery")
+    return MemoryBackend()
+
+
+bus = Bus()
@@ -0,0 +1,158 @@
+"""
+Sliding-window rate limiting.
+
+Each key keeps two fixed-window counters (previous and current window). The
+request rate is estimated as
+
+    prev_count * (share of the previous window still inside the sliding window)
+    + curr_count
+
+which is O(1) state per key, unlike a list of timestamps. Only allowed hits
+are counted, so a client being throttled doesn't extend its own lockout.
+
+Stores:
+- "memory":   per-worker, LRU-bounded to RATE_LIMIT_MAX_KEYS keys
+- "postgres": the rate_limits table, shared by every gunicorn worker; each hit
+              is one atomic upsert, and stale rows are purged periodically
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db import session as db_session
+
+logger = logging.getLogger(__name__)
+
+
+def _windows(now: float, window: int) -> Tuple[int, float]:
+    """Current window start and the weight of the previous window."""
+    window_start = int(now // window) * window
+    prev_weight = 1.0 - (now - window_start) / window
+    return window_start, prev_weight
+
+
+class MemoryRateLimitStore:
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        # key -> [window_start, prev_count, curr_count]
+        self._counters: "OrderedDict[str, list]" = OrderedDict()
+        # Sync routes run in the threadpool
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, limit: int, window: int, now: float) -> bool:
+        window_start, prev_weight = _windows(now, window)
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = [window_start, 0, 0]
+                self._counters[key] = counter
+                if len(self._counters) > self.max_keys:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(key)
+
+            if counter[0] != window_start:
+                # Roll over: the old current window becomes previous, unless it's older than that
+                counter[1] = counter[2] if counter[0] == window_start - window else 0
+                counter[2] = 0
+                counter[0] = window_start
+
+            if counter[1] * prev_weight + counter[2] >= limit:
+                return False
+            counter[2] += 1
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+class PostgresRateLimitStore:
+    # Roll the row over to the current window, then count the hit only if
+    # the estimate stays under the limit. No row returned means throttled.
+    _HIT = text("""
+        INSERT INTO rate_limits AS r (key, window_start, prev_count, curr_count, expires_at)
+        VALUES (:key, :window_start, 0, 1, :expires_at)
+        ON CONFLICT (key) DO UPDATE SET
+            prev_count = CASE
+                WHEN r.window_start = :window_start THEN r.prev_count
+                WHEN r.window_start = :window_start - :window THEN r.curr_count
+                ELSE 0 END,
+            curr_count = CASE
+                WHEN r.window_start = :window_start THEN r.curr_count + 1
+                ELSE 1 END,
+            window_start = :window_start,
+            expires_at = :expires_at
+        WHERE
+            CASE
+                WHEN r.window_start = :window_start THEN r.prev_count
+                WHEN r.window_start = :window_start - :window THEN r.curr_count
+                ELSE 0 END * :prev_weight
+            + CASE WHEN r.window_start = :window_start THEN r.curr_count ELSE 0 END
+            < :limit
+        RETURNING r.curr_count
+    """)
+    _PURGE = text("DELETE FROM rate_limits WHERE expires_at < :now")
+
+    def __init__(self, purge_every: int = 1000):
+        self.purge_every = purge_every
+        self._hits = 0
+
+    def hit(self, key: str, limit: int, window: int, now: float) -> bool:
+        window_start, prev_weight = _windows(now, window)
+        with db_session.engine.begin() as conn:
+            row = conn.execute(self._HIT, {
+                "key": key,
+                "window_start": window_start,
+                "window": window,
+                "prev_weight": prev_weight,
+                "limit": limit,
+                # Both windows have passed: the row no longer affects any estimate
+                "expires_at": window_start + 2 * window,
+            }).first()
+        self._hits += 1
+        if self._hits % self.purge_every == 0:
+            self.purge(now)
+        return row is not None
+
+    def purge(self, now: float) -> None:
+        with db_session.engine.begin() as conn:
+            conn.execute(self._PURGE, {"now": int(now)})
+
+    def clear(self) -> None:
+        with db_session.engine.begin() as conn:
+            conn.execute(text("DELETE FROM rate_limits"))
+
+
+def create_store(name: str):
+    if name == "postgres":
+        return PostgresRateLimitStore()
+    if name != "memory":
+        logger.warning(f"Unknown RATE_LIMIT_BACKEND '{name}', using memory")
+    return MemoryRateLimitStore(settings.RATE_LIMIT_MAX_KEYS)
+
+
+store = create_store(settings.RATE_LIMIT_BACKEND)
+
+
+class RateLimiter:
+    """At most `limit` hits per key in any `window` seconds (approximately)."""
+
+    def __init__(self, name: str, limit: int, window: int):
+        self.name = name
+        self.limit = limit
+        self.window = window
+
+    def hit(self, key: str) -> bool:
+        """Count a hit for `key`. Returns False if it's over the limit."""
+        try:
+            return store.hit(f"{self.name}:{key}", self.limit, self.window, time.time())
+        except Exception as e:
+            # Fail open: a rate-limit outage shouldn't take the route down with it
+            logger.error(f"Rate limiter '{self.name}' unavailable: {e}")
+            return True
@@ -0,0 +1,100 @@
+"""
+Response cache for the public feed and trending lists.
+
+Stores each page once per (query params, admin-or-not) as already-serialized
+JSON, with user_vote left empty. Logged-out requests get the cached bytes as
+is; logged-in requests only look up their own votes for the page's post ids
+and overlay them, so neither case loads or re-validates Post rows.
+
+Freshness:
+- post create/delete/pin/unpin clear the cache on every worker (via the bus)
+- vote, comment and share counters may lag by at most FEED_CACHE_TTL_SECONDS,
+  which is the staleness budget for counters
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+from app.core.config import settings
+from app.core.pubsub import bus
+
+
+class CachedPage:
+    __slots__ = ("rows", "body", "ids", "next_cursor", "expires_at")
+
+    def __init__(self, rows: List[dict], next_cursor: Optional[str], expires_at: float):
+        self.rows = rows
+        self.body = json.dumps(rows, separators=(",", ":")).encode("utf-8")
+        self.ids = [row["id"] for row in rows]
+        self.next_cursor = next_cursor
+        self.expires_at = expires_at
+
+    def render(self, user_votes: Dict[int, int]) -> bytes:
+        """The page as JSON bytes, with one viewer's votes filled in."""
+        if not user_votes:
+            return self.body
+        rows = [
+            {**row, "user_vote": user_votes[row["id"]]} if row["id"] in user_votes else row
+            for row in self.rows
+        ]
+        return json.dumps(rows, separators=(",", ":")).encode("utf-8")
+
+
+class ResponseCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedPage]" = OrderedDict()
+        # Bumped on every invalidation; a page built before one is never stored
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedPage]:
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None:
+                return None
+            if page.expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return page
+
+    def put(self, key: Hashable, rows: List[dict], next_cursor: Optional[str], generation: int) -> CachedPage:
+        """Cache a page built from data read at `generation`. Rows must have user_vote cleared."""
+        page = CachedPage(rows, next_cursor, time.time() + self.ttl_seconds)
+        if self.ttl_seconds <= 0:
+            return page
+        with self._lock:
+            if generation != self.generation:
+                return page
+            self._entries[key] = page
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return page
+
+    def invalidate(self) -> None:
+        """Drop every cached page on this worker and tell the others."""
+        self._invalidate_local()
+        bus.publish_threadsafe("feed_cache", {})
+
+    def _invalidate_local(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    async def on_invalidate(self, payload: dict) -> None:
+        """Bus subscriber for invalidations published by other workers."""
+        self._invalidate_local()
+
+
+feed_cache = ResponseCache(
+    ttl_seconds=settings.FEED_CACHE_TTL_SECONDS,
+    max_entries=settings.FEED_CACHE_MAX_ENTRIES,
+)
+bus.subscribe("feed_cache", feed_cache.on_invalidate)
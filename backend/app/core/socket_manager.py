@@ -1,39 +1,143 @@
-from typing import List, Dict
+import asyncio
+import json
+import logging
+from typing import List, Dict, Optional
 from fastapi import WebSocket
+from app.core.config import settings
+from app.core.pubsub import bus
+
+logger = logging.getLogger(__name__)
+
+
+class _Client:
+    """
+    One accepted socket with its own bounded outbound queue.
+
+    A dedicated writer task drains the queue, so a slow client only delays
+    itself; the broadcaster never awaits a send.
+    """
+
+    def __init__(self, websocket: WebSocket, user_id: int, queue_size: int):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+
 
 class ConnectionManager:
-    def __init__(self):
-        # Map user_id to list of active websockets (user might have multiple tabs)
-        self.active_connections: Dict[int, List[WebSocket]] = {}
+    """
+    Tracks the sockets owned by this worker.
+
+    Outgoing messages are published on the pub/sub bus and every worker
+    delivers them to its own sockets, so a broadcast reaches clients
+    connected to any gunicorn worker.
+
+    Delivery serializes each message once and enqueues it on every target's
+    outbound queue. Sockets that error, time out, or fall more than a full
+    queue behind are evicted.
+    """
+
+    def __init__(self, send_timeout: float = 5.0, queue_size: int = 64):
+        # Map user_id to list of active clients (user might have multiple tabs)
+        self.active_connections: Dict[int, List[_Client]] = {}
+        self.send_timeout = send_timeout
+        self.queue_size = queue_size
+        self.delivered = 0
+        self.dropped = 0
+        self.evicted = 0
 
     async def connect(self, websocket: WebSocket, user_id: int):
         await websocket.accept()
+        client = _Client(websocket, user_id, self.queue_size)
+        client.writer = asyncio.create_task(self._write_loop(client))
         if user_id not in self.active_connections:
             self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
+        self.active_connections[user_id].append(client)
+
+    def _remove(self, client: _Client) -> bool:
+        clients = self.active_connections.get(client.user_id)
+        if not clients or client not in clients:
+            return False
+        clients.remove(client)
+        if not clients:
+            del self.active_connections[client.user_id]
+        if client.writer and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+        return True
 
     def disconnect(self, websocket: WebSocket, user_id: int):
-        if user_id in self.active_connections:
-            if websocket in self.active_connections[user_id]:
-                self.active_connections[user_id].remove(websocket)
-            if not self.active_connections[user_id]:
-                del self.active_connections[user_id]
+        for client in list(self.active_connections.get(user_id, [])):
+            if client.websocket is websocket:
+                self._remove(client)
+
+    def _evict(self, client: _Client, reason: str):
+        if not self._remove(client):
+            return
+        self.evicted += 1
+        self.dropped += client.queue.qsize()
+        logger.info(f"Evicting websocket for user {client.user_id}: {reason}")
+        asyncio.create_task(self._close(client.websocket))
+
+    @staticmethod
+    async def _close(websocket: WebSocket):
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+    async def _write_loop(self, client: _Client):
+        while True:
+            text = await client.queue.get()
+            try:
+                await asyncio.wait_for(client.websocket.send_text(text), self.send_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                self._evict(client, "send timed out")
+                return
+            except Exception as e:
+                # Broken pipe or stale connection
+                self.dropped += 1
+                self._evict(client, f"send failed ({e.__class__.__name__})")
+                return
+            self.delivered += 1
 
     async def send_personal_message(self, message: dict, user_id: int):
-        if user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    # Handle broken pipe or stale connection
-                    pass
+        await bus.publish("ws", {"user_id": user_id, "message": message})
 
     async def broadcast(self, message: dict):
-        for user_id in self.active_connections:
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    pass
-
-manager = ConnectionManager()
+        await bus.publish("ws", {"user_id": None, "message": message})
+
+    async def deliver(self, payload: dict):
+        """Bus subscriber: push a published message to this worker's sockets."""
+        user_id: Optional[int] = payload.get("user_id")
+
+        if user_id is None:
+            targets = [c for clients in self.active_connections.values() for c in clients]
+        else:
+            targets = list(self.active_connections.get(user_id, []))
+        if not targets:
+            return
+
+        text = json.dumps(payload["message"], default=str)
+        for client in targets:
+            try:
+                client.queue.put_nowait(text)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                self._evict(client, "outbound queue full")
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "connections": sum(len(c) for c in self.active_connections.values()),
+            "users": len(self.active_connections),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "evicted": self.evicted,
+        }
+
+manager = ConnectionManager(
+    send_timeout=settings.WS_SEND_TIMEOUT_SECONDS,
+    queue_size=settings.WS_OUTBOUND_QUEUE_SIZE,
+)
+bus.subscribe("ws", manager.deliver)
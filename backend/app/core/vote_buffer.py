@@ -0,0 +1,153 @@
+"""
+Write-behind buffer for vote counters.
+
+When enabled (VOTE_WRITE_BEHIND=true), cast_vote still records each Vote row
+immediately but parks the upvotes/downvotes deltas here instead of updating
+the post/comment row in the request. Deltas are coalesced per target and
+flushed in one batched UPDATE every VOTE_FLUSH_INTERVAL_SECONDS, or sooner
+once VOTE_FLUSH_THRESHOLD votes are pending, so a viral post takes one row
+lock per flush instead of one per voter.
+
+Reads merge the pending deltas of this worker; other workers' deltas show up
+after their next flush.
+"""
+import asyncio
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import bindparam, update
+
+from app.core.config import settings
+from app.crud.post import VOTE_WEIGHT
+from app.db import session as db_session
+from app.models.comment import Comment
+from app.models.post import Post
+
+logger = logging.getLogger(__name__)
+
+_MODELS = {"post": Post, "comment": Comment}
+
+
+class VoteCounterBuffer:
+    def __init__(self, enabled: bool, flush_interval: float, flush_threshold: int):
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        # (target_type, target_id) -> [up_delta, down_delta]
+        self._pending: Dict[Tuple[str, int], list] = {}
+        self._pending_votes = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, target_type: str, target_id: int, up_delta: int, down_delta: int) -> None:
+        if not (up_delta or down_delta):
+            return
+        with self._lock:
+            delta = self._pending.setdefault((target_type, target_id), [0, 0])
+            delta[0] += up_delta
+            delta[1] += down_delta
+            self._pending_votes += 1
+            full = self._pending_votes >= self.flush_threshold
+        if full and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def pending(self, target_type: str, target_id: int) -> Tuple[int, int]:
+        with self._lock:
+            up, down = self._pending.get((target_type, target_id), (0, 0))
+        return up, down
+
+    def merge_into(self, target_type: str, items: Iterable) -> None:
+        """Add pending deltas to ORM objects or dict rows about to be returned."""
+        if not self._pending:
+            return
+        for item in items:
+            is_dict = isinstance(item, dict)
+            up, down = self.pending(target_type, item["id"] if is_dict else item.id)
+            if not (up or down):
+                continue
+            if is_dict:
+                item["upvotes"] = (item["upvotes"] or 0) + up
+                item["downvotes"] = (item["downvotes"] or 0) + down
+            else:
+                item.upvotes = (item.upvotes or 0) + up
+                item.downvotes = (item.downvotes or 0) + down
+
+    def flush(self) -> int:
+        """Write all pending deltas in one batched UPDATE per target type. Returns targets flushed."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+            self._pending_votes = 0
+        if not batch:
+            return 0
+
+        db = db_session.SessionLocal()
+        try:
+            for target_type, model in _MODELS.items():
+                params = [
+                    {"target_id": target_id, "up": up, "down": down, "score": (up - down) * VOTE_WEIGHT}
+                    for (kind, target_id), (up, down) in batch.items()
+                    if kind == target_type
+                ]
+                if not params:
+                    continue
+                values = {
+                    "upvotes": model.upvotes + bindparam("up"),
+                    "downvotes": model.downvotes + bindparam("down"),
+                }
+                if model is Post:
+                    values["popularity_score"] = Post.popularity_score + bindparam("score")
+                stmt = update(model.__table__)\
+                    .where(model.__table__.c.id == bindparam("target_id"))\
+                    .values(**values)
+                db.execute(stmt, params)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Vote counter flush failed, re-queueing {len(batch)} targets: {e}")
+            with self._lock:
+                for key, (up, down) in batch.items():
+                    delta = self._pending.setdefault(key, [0, 0])
+                    delta[0] += up
+                    delta[1] += down
+            return 0
+        finally:
+            db.close()
+        return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await asyncio.to_thread(self.flush)
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._loop = None
+        if self.enabled:
+            await asyncio.to_thread(self.flush)
+
+
+vote_buffer = VoteCounterBuffer(
+    enabled=settings.VOTE_WRITE_BEHIND,
+    flush_interval=settings.VOTE_FLUSH_INTERVAL_SECONDS,
+    flush_threshold=settings.VOTE_FLUSH_THRESHOLD,
+)
@@ -1,9 +1,13 @@
-from sqlalchemy.orm import Session, joinedload
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from app.models.comment import Comment
 from app.schemas.comment import CommentCreate
-from app.crud.reaction import get_reaction_counts
+from app.crud.reaction import get_reaction_counts_bulk
 
-def create_comment(db: Session, comment: CommentCreate, post_id: int, author_id: int, parent_id: int = None):
+async def create_comment(db: AsyncSession, comment: CommentCreate, post_id: int, author_id: int, parent_id: int = None):
     db_comment = Comment(
         content=comment.content,
         post_id=post_id,
@@ -11,34 +15,95 @@ def create_comment(db: Session, comment: CommentCreate, post_id: int, author_id:
         parent_id=parent_id
     )
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    await db.flush()  # Assigns the id; the caller commits with its other writes
     return db_comment
 
+def comment_row(comment: Comment, reactions: list) -> dict:
+    # Plain dict: assigning summaries to the `reactions` relationship would corrupt the ORM collection
+    data = {col.key: getattr(comment, col.key) for col in Comment.__table__.columns}
+    data["reactions"] = reactions
+    data["replies"] = []
+    return data
+
 def get_comments_by_post(db: Session, post_id: int, user_id: int = None):
     # Get all comments for post
-    comments = db.query(Comment).options(joinedload(Comment.author)).filter(Comment.post_id == post_id).order_by(Comment.created_at).all()
+    comments = db.query(Comment).filter(Comment.post_id == post_id).order_by(Comment.created_at).all()
+    
+    # Reactions for the whole thread in one aggregate query
+    reactions = get_reaction_counts_bulk(db, "comment", [c.id for c in comments], user_id)
     
-    # We want to return a nested structure, but Pydantic models are flat or recursive.
-    # Let's populate reactions first.
+    # Flat list; the frontend threads it via parent_id
+    return [comment_row(c, reactions.get(c.id, [])) for c in comments]
+
+def get_comment_tree(
+    db: Session,
+    post_id: int,
+    user_id: int = None,
+    parent_id: int = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 20,
+    replies_limit: int = 5,
+    max_depth: int = 3,
+):
+    """
+    Build a bounded page of a comment thread.
     
-    # Optimization: Fetch all reactions for these comments in one query? 
-    # For simplicity, call get_reaction_counts loop or leave empty for now.
-    # Ideally, we enrich the objects.
+    Level 0 is up to `limit` children of `parent_id` (top-level comments when
+    None) after the (created_at, id) key `after`. Each further level holds at
+    most `replies_limit` replies per parent, down to `max_depth` levels. One
+    query per level, one child-count query for the deepest level and one
+    reaction query, regardless of thread size.
     
-    # Let's just return flat list and let frontend partial nest, 
-    # OR build tree here.
+    Truncated branches get has_more_replies=True; when part of the branch was
+    sent, it continues after the (created_at, id) of its last reply.
     
-    # For now, simplistic approach: attach reactions manually
-    for c in comments:
-        c.reactions = get_reaction_counts(db, "comment", c.id, user_id)
-        c.replies = [] # Reset for recursion if needed, though SQLALchemy relations handle this lazily
-
-    # If we want detailed tree, we filter parent_id=None and let SQLAlchemy load replies.
-    # But getting reaction counts for nested replies is tricky with lazy loading.
+    Returns (roots, next_key) where next_key is the (created_at, id) of the
+    last root if more siblings follow, else None.
+    """
+    key_order = (Comment.created_at, Comment.id)
+    
+    # Level 0: keyset page of siblings
+    query = db.query(Comment).filter(Comment.post_id == post_id, Comment.parent_id == parent_id)
+    if after:
+        query = query.filter(tuple_(Comment.created_at, Comment.id) > tuple_(*after))
+    roots = query.order_by(*key_order).limit(limit + 1).all()
+    next_key = None
+    if len(roots) > limit:
+        roots = roots[:limit]
+        next_key = (roots[-1].created_at, roots[-1].id)
+    
+    # Deeper levels: at most replies_limit + 1 rows per parent (the extra row only flags "more")
+    levels = [roots]
+    overflowing = set()
+    for _ in range(max_depth - 1):
+        parent_ids = [c.id for c in levels[-1]]
+        if not parent_ids:
+            break
+        rn = func.row_number().over(partition_by=Comment.parent_id, order_by=key_order).label("rn")
+        ranked = db.query(Comment.id.label("id"), rn).filter(Comment.parent_id.in_(parent_ids)).subquery()
+        rows = db.query(Comment, ranked.c.rn).join(ranked, Comment.id == ranked.c.id)\
+            .filter(ranked.c.rn <= replies_limit + 1)\
+            .order_by(*key_order).all()
+        overflowing.update(c.parent_id for c, position in rows if position > replies_limit)
+        levels.append([c for c, position in rows if position <= replies_limit])
+    
+    # Deepest level: only need to know whether a branch continues
+    deepest_ids = [c.id for c in levels[-1]] if len(levels) == max_depth else []
+    unexpanded = set(
+        parent for (parent,) in db.query(Comment.parent_id)
+        .filter(Comment.parent_id.in_(deepest_ids)).distinct()
+    ) if deepest_ids else set()
+    
+    all_comments = [c for level in levels for c in level]
+    reactions = get_reaction_counts_bulk(db, "comment", [c.id for c in all_comments], user_id)
     
-    # Let's return the simplified list and let frontend handle threading visually via parent_id,
-    # OR creating a recursive response.
+    # Single pass: rows are ordered, so each parent's replies arrive in order
+    nodes = {}
+    for c in all_comments:
+        node = comment_row(c, reactions.get(c.id, []))
+        node["has_more_replies"] = c.id in unexpanded or c.id in overflowing
+        nodes[c.id] = node
+        if c.parent_id in nodes and c.parent_id != parent_id:
+            nodes[c.parent_id]["replies"].append(node)
     
-    # Better: Return all comments, let frontend build tree.
-    return comments
+    return [nodes[c.id] for c in roots], next_key
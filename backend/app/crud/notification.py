@@ -0,0 +1,218 @@
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, any_, case, cast, exists, func, or_, select, String
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from app.models.announcement import Announcement, AnnouncementReadState, AnnouncementRead
+from app.models.notification import Notification
+from app.models.user import User
+from app.core.config import settings
+
+async def create_announcement(db: AsyncSession, sender_id: int, title: str, message: str) -> Announcement:
+    # One row per announcement, regardless of how many users will see it
+    announcement = Announcement(
+        sender_id=sender_id,
+        title=title,
+        message=message,
+        created_at=datetime.utcnow()
+    )
+    db.add(announcement)
+    await db.commit()
+    return announcement
+
+def visible_announcements(db: Session, user: User):
+    """Announcements a user receives: sent by someone else after they joined."""
+    query = db.query(Announcement).filter(
+        or_(Announcement.sender_id == None, Announcement.sender_id != user.id)
+    )
+    if user.created_at:
+        query = query.filter(Announcement.created_at >= user.created_at)
+    return query
+
+def get_read_through_id(db: Session, user_id: int) -> int:
+    state = db.query(AnnouncementReadState).filter(AnnouncementReadState.user_id == user_id).first()
+    return state.read_through_id if state else 0
+
+def get_announcements_for_user(
+    db: Session, user: User, limit: int, before: Optional[Tuple[datetime, int]] = None
+) -> List[dict]:
+    """
+    Newest `limit` announcements for a user, with is_read resolved from the watermark.
+    
+    `before` is a notification-list key (created_at, entry id); announcement
+    entries use -announcement.id, so ties on created_at continue at higher ids.
+    """
+    query = visible_announcements(db, user)
+    if before:
+        created_at, entry_id = before
+        query = query.filter(or_(
+            Announcement.created_at < created_at,
+            and_(Announcement.created_at == created_at, Announcement.id > -entry_id)
+        ))
+    announcements = query\
+        .options(joinedload(Announcement.sender))\
+        .order_by(Announcement.created_at.desc(), Announcement.id.asc())\
+        .limit(limit).all()
+    if not announcements:
+        return []
+    
+    read_through = get_read_through_id(db, user.id)
+    above = [a.id for a in announcements if a.id > read_through]
+    read_marks = set()
+    if above:
+        read_marks = {
+            row[0] for row in db.query(AnnouncementRead.announcement_id).filter(
+                AnnouncementRead.user_id == user.id,
+                AnnouncementRead.announcement_id.in_(above)
+            )
+        }
+    
+    return [
+        {
+            "announcement": a,
+            "is_read": a.id <= read_through or a.id in read_marks,
+        }
+        for a in announcements
+    ]
+
+def mark_announcement_read(db: Session, user_id: int, announcement_id: int) -> bool:
+    if not db.query(Announcement.id).filter(Announcement.id == announcement_id).first():
+        return False
+    if announcement_id <= get_read_through_id(db, user_id):
+        return True
+    exists = db.query(AnnouncementRead).filter(
+        AnnouncementRead.user_id == user_id,
+        AnnouncementRead.announcement_id == announcement_id
+    ).first()
+    if not exists:
+        db.add(AnnouncementRead(user_id=user_id, announcement_id=announcement_id))
+    db.commit()
+    return True
+
+def mark_all_announcements_read(db: Session, user_id: int) -> None:
+    """Advance the watermark to the newest announcement and drop the individual marks below it."""
+    latest = db.query(func.max(Announcement.id)).scalar() or 0
+    state = db.query(AnnouncementReadState).filter(AnnouncementReadState.user_id == user_id).first()
+    if state is None:
+        db.add(AnnouncementReadState(user_id=user_id, read_through_id=latest))
+    elif state.read_through_id < latest:
+        state.read_through_id = latest
+    db.query(AnnouncementRead).filter(
+        AnnouncementRead.user_id == user_id,
+        AnnouncementRead.announcement_id <= latest
+    ).delete(synchronize_session=False)
+
+def unread_count_query(user_id: int):
+    """
+    Unread badge count in one round-trip: unread personal notifications
+    (counted on the ix_notifications_recipient_unread partial index) plus
+    visible announcements above the read watermark without an individual mark.
+    """
+    personal = select(func.count()).select_from(Notification).where(
+        Notification.recipient_id == user_id,
+        Notification.is_read.isnot(True)
+    ).scalar_subquery()
+    
+    joined_at = select(User.created_at).where(User.id == user_id).scalar_subquery()
+    read_through = select(AnnouncementReadState.read_through_id)\
+        .where(AnnouncementReadState.user_id == user_id).scalar_subquery()
+    announcements = select(func.count()).select_from(Announcement).where(
+        or_(Announcement.sender_id == None, Announcement.sender_id != user_id),
+        Announcement.created_at >= func.coalesce(joined_at, Announcement.created_at),
+        Announcement.id > func.coalesce(read_through, 0),
+        ~exists().where(
+            AnnouncementRead.user_id == user_id,
+            AnnouncementRead.announcement_id == Announcement.id
+        )
+    ).scalar_subquery()
+    
+    return select(personal + announcements)
+
+def get_unread_count(db: Session, user_id: int) -> int:
+    return db.execute(unread_count_query(user_id)).scalar() or 0
+
+async def get_unread_count_async(db: AsyncSession, user_id: int) -> int:
+    return (await db.execute(unread_count_query(user_id))).scalar() or 0
+
+def unread_count_message(count: int) -> dict:
+    """WebSocket message telling a user's clients their new badge count."""
+    return {"type": "unread_count", "count": count}
+
+def aggregation_bucket(now: datetime) -> datetime:
+    """Start of the aggregation window containing `now`."""
+    window = settings.NOTIFICATION_AGGREGATION_WINDOW_SECONDS
+    elapsed = int((now - datetime(1970, 1, 1)).total_seconds())
+    return datetime(1970, 1, 1) + timedelta(seconds=elapsed - elapsed % window)
+
+async def add_event(
+    db: AsyncSession,
+    recipient_id: int,
+    sender: User,
+    type: str,
+    title: str,
+    action: str,
+    reference_id: int,
+    reference_type: str = "post"
+) -> Optional[dict]:
+    """
+    Record "<sender> <action>" for a recipient, aggregated per (recipient,
+    type, reference) and time window into one row: "A and 4 others upvoted
+    your post". One upsert on uq_notifications_aggregate, no read-before-write;
+    a sender already counted in the window is a no-op.
+    
+    Returns the notification as a push message, or None if nothing changed.
+    The caller commits.
+    """
+    now = datetime.utcnow()
+    n = Notification.__table__.c
+    stmt = pg_insert(Notification).values(
+        recipient_id=recipient_id,
+        sender_id=sender.id,
+        type=type,
+        title=title,
+        message=f"{sender.full_name} {action}",
+        reference_id=reference_id,
+        reference_type=reference_type,
+        is_read=False,
+        created_at=now,
+        bucket=aggregation_bucket(now),
+        actor_ids=[sender.id],
+        actor_count=1,
+    )
+    others = cast(n.actor_count, String)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[n.recipient_id, n.type, n.reference_type, n.reference_id, n.bucket],
+        set_={
+            "sender_id": stmt.excluded.sender_id,
+            "actor_ids": func.array_append(n.actor_ids, stmt.excluded.sender_id),
+            "actor_count": n.actor_count + 1,
+            "message": func.concat(
+                sender.full_name, " and ", others,
+                case((n.actor_count == 1, " other "), else_=" others "), action
+            ),
+            # Resurface as a fresh, unread notification
+            "is_read": False,
+            "created_at": stmt.excluded.created_at,
+        },
+        where=~(stmt.excluded.sender_id == any_(n.actor_ids)),
+    ).returning(n.id, n.message, n.actor_count, n.created_at)
+    
+    row = (await db.execute(stmt)).first()
+    if row is None:
+        return None
+    return {
+        "id": row.id,
+        "type": type,
+        "title": title,
+        "message": row.message,
+        "reference_id": reference_id,
+        "reference_type": reference_type,
+        "actor_count": row.actor_count,
+        "sender": {
+            "id": sender.id,
+            "name": sender.full_name,
+            "profile_photo": sender.profile_photo_url
+        },
+        "created_at": row.created_at.isoformat(),
+    }
@@ -1,7 +1,36 @@
+from typing import List, Optional
 from sqlalchemy.orm import Session
-from app.models.post import Post
+from app.models.post import Post, PostTag
 from app.schemas.post import PostCreate
 
+# Trending weights: Popularity = (Net Votes) + (Comments * 2) + (Shares * 3)
+VOTE_WEIGHT = 1
+COMMENT_WEIGHT = 2
+SHARE_WEIGHT = 3
+
+def bump_popularity(post: Post, delta: int):
+    """
+    Apply a change to the materialized trending score.
+    
+    Assigned as a SQL expression (popularity_score = popularity_score + delta)
+    so concurrent writers never overwrite each other. Commit with the counter change.
+    """
+    if delta:
+        post.popularity_score = Post.popularity_score + delta
+
+def parse_tags(tags: Optional[str]) -> List[str]:
+    """Comma-separated tags -> unique, lowercased tag keys (order kept)."""
+    seen = []
+    for tag in (tags or "").split(","):
+        key = tag.strip().lower()
+        if key and key not in seen:
+            seen.append(key)
+    return seen
+
+def set_post_tags(post: Post, tags: Optional[str]):
+    """Sync the post_tags rows with a comma-separated tags string. Commit with the post."""
+    post.tag_rows = [PostTag(tag=tag) for tag in parse_tags(tags)]
+
 def create_post(db: Session, post: PostCreate, author_id: int = None):
     db_post = Post(
         title=post.title,
@@ -15,6 +44,7 @@ def create_post(db: Session, post: PostCreate, author_id: int = None):
         media_public_id=post.media_public_id,
         media_type=post.media_type
     )
+    set_post_tags(db_post, post.tags)
     db.add(db_post)
     db.commit()
     db.refresh(db_post)
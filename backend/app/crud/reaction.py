@@ -1,5 +1,6 @@
+from typing import Dict, List
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case, literal
 from app.models.reaction import Reaction
 
 def toggle_reaction(db: Session, user_id: int, emoji: str, target_type: str, target_id: int):
@@ -35,27 +36,34 @@ def toggle_reaction(db: Session, user_id: int, emoji: str, target_type: str, tar
     db.commit()
     return new_reaction
 
-def get_reaction_counts(db: Session, target_type: str, target_id: int, user_id: int = None):
-    # Group by emoji
-    query = db.query(Reaction.emoji, func.count(Reaction.id))
-    if target_type == 'post':
-        query = query.filter(Reaction.post_id == target_id)
-    else:
-        query = query.filter(Reaction.comment_id == target_id)
+def get_reaction_counts_bulk(db: Session, target_type: str, target_ids: List[int], user_id: int = None) -> Dict[int, List[dict]]:
+    """
+    Reaction summaries for many targets in one GROUP BY query.
     
-    counts = query.group_by(Reaction.emoji).all()
+    Returns {target_id: [{"emoji", "count", "user_reacted"}, ...]}; targets
+    without reactions are absent. user_reacted is folded into the same
+    aggregate, so there is no second query per target.
+    """
+    if not target_ids:
+        return {}
+    target_col = Reaction.post_id if target_type == 'post' else Reaction.comment_id
     
-    # Check user reactions
-    user_reactions = set()
     if user_id:
-        u_query = db.query(Reaction.emoji).filter(Reaction.user_id == user_id)
-        if target_type == 'post':
-            u_query = u_query.filter(Reaction.post_id == target_id)
-        else:
-            u_query = u_query.filter(Reaction.comment_id == target_id)
-        user_reactions = {r[0] for r in u_query.all()}
+        user_reacted = func.max(case((Reaction.user_id == user_id, 1), else_=0))
+    else:
+        user_reacted = literal(0)
+    
+    rows = db.query(target_col, Reaction.emoji, func.count(Reaction.id), user_reacted)\
+        .filter(target_col.in_(target_ids))\
+        .group_by(target_col, Reaction.emoji)\
+        .all()
+    
+    result: Dict[int, List[dict]] = {}
+    for target_id, emoji, count, reacted in rows:
+        result.setdefault(target_id, []).append(
+            {"emoji": emoji, "count": count, "user_reacted": bool(reacted)}
+        )
+    return result
 
-    return [
-        {"emoji": emoji, "count": count, "user_reacted": emoji in user_reactions}
-        for emoji, count in counts
-    ]
+def get_reaction_counts(db: Session, target_type: str, target_id: int, user_id: int = None):
+    return get_reaction_counts_bulk(db, target_type, [target_id], user_id).get(target_id, [])
@@ -0,0 +1,127 @@
+from typing import Dict, List, Optional
+from sqlalchemy import delete, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.vote import Vote
+from app.models.post import Post
+from app.models.comment import Comment
+from app.crud.post import VOTE_WEIGHT
+
+async def apply_vote(
+    db: AsyncSession,
+    user_id: int,
+    vote_type: int,
+    post_id: int = None,
+    comment_id: int = None,
+    defer_counters: bool = False
+) -> Optional[dict]:
+    """
+    Toggle/switch/add a vote without read-modify-write.
+
+    1. DELETE the same vote if present (toggle off)
+    2. otherwise upsert on the (user_id, target) unique index; xmax = 0 tells
+       an insert from an update
+    3. apply the counter deltas as `upvotes = upvotes + :d` in one UPDATE,
+       which also returns the fresh counts
+
+    All in one transaction, so concurrent voters never lose increments.
+    Returns None if the target doesn't exist.
+
+    defer_counters=True skips step 3 (no row lock on the target) and only
+    reads the current counts; the caller hands up_delta/down_delta to the
+    write-behind buffer after committing.
+    """
+    model = Post if post_id else Comment
+    target_id = post_id or comment_id
+    target_col = Vote.post_id if post_id else Vote.comment_id
+
+    up_delta = down_delta = 0
+
+    removed = (await db.execute(
+        delete(Vote)
+        .where(Vote.user_id == user_id, target_col == target_id, Vote.vote_type == vote_type)
+        .returning(Vote.id)
+    )).first()
+
+    if removed:
+        status = "removed"
+        if vote_type == 1:
+            up_delta = -1
+        else:
+            down_delta = -1
+    else:
+        stmt = pg_insert(Vote).values(
+            user_id=user_id, post_id=post_id, comment_id=comment_id, vote_type=vote_type
+        )
+        stmt = stmt.on_conflict_do_update(
+            # Inference also matches the partial unique indexes of older schemas
+            index_elements=[Vote.user_id, target_col],
+            index_where=target_col.isnot(None),
+            set_={"vote_type": stmt.excluded.vote_type},
+            where=Vote.vote_type != stmt.excluded.vote_type,
+        ).returning(literal_column("(xmax = 0)").label("inserted"))
+        try:
+            row = (await db.execute(stmt)).first()
+        except IntegrityError:
+            # FK violation: target doesn't exist
+            await db.rollback()
+            return None
+
+        if row is None:
+            # A concurrent request already recorded this exact vote
+            status = "unchanged"
+        elif row.inserted:
+            status = "added"
+        else:
+            status = "switched"
+
+        if status == "added" or status == "switched":
+            if vote_type == 1:
+                up_delta = 1
+                down_delta = -1 if status == "switched" else 0
+            else:
+                down_delta = 1
+                up_delta = -1 if status == "switched" else 0
+
+    if defer_counters:
+        counts = (await db.execute(
+            select(model.upvotes, model.downvotes, model.author_id).where(model.id == target_id)
+        )).first()
+    else:
+        values = {
+            "upvotes": model.upvotes + up_delta,
+            "downvotes": model.downvotes + down_delta,
+        }
+        if model is Post:
+            values["popularity_score"] = Post.popularity_score + (up_delta - down_delta) * VOTE_WEIGHT
+        counts = (await db.execute(
+            update(model)
+            .where(model.id == target_id)
+            .values(**values)
+            .returning(model.upvotes, model.downvotes, model.author_id)
+        )).first()
+
+    if counts is None:
+        await db.rollback()
+        return None
+
+    return {
+        "status": status,
+        "upvotes": counts.upvotes,
+        "downvotes": counts.downvotes,
+        "author_id": counts.author_id,
+        "up_delta": up_delta,
+        "down_delta": down_delta,
+    }
+
+def get_user_votes(db: Session, user_id: int, target_type: str, target_ids: List[int]) -> Dict[int, int]:
+    """A user's votes on a page of posts or comments in one query: {target_id: vote_type}."""
+    if not user_id or not target_ids:
+        return {}
+    target_col = Vote.post_id if target_type == "post" else Vote.comment_id
+    rows = db.query(target_col, Vote.vote_type)\
+        .filter(Vote.user_id == user_id, target_col.in_(target_ids))\
+        .all()
+    return {target_id: vote_type for target_id, vote_type in rows}
@@ -0,0 +1,197 @@
+"""
+Create the baseline schema: every table as it stood when versioned migrations began.
+
+Frozen here on purpose, not read from app.models, so that replaying the chain
+builds the same database whatever the models look like later; schema changes
+go into new migrations. On a database from before versioned migrations only
+the missing tables are created (with their indexes); the following migrations
+bring existing tables up to date. Search triggers are installed by 0003.
+"""
+from sqlalchemy import (
+    JSON, BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, MetaData,
+    PrimaryKeyConstraint, String, Table, Text, UniqueConstraint, func, text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String, nullable=False, unique=True, index=True),
+    Column("hashed_password", String),
+    Column("is_active", Boolean),
+    Column("enrollment_number", String, unique=True, index=True),
+    Column("auth_provider", String),
+    Column("username", String, unique=True, index=True),
+    Column("full_name", String),
+    Column("department", String),
+    Column("role", String),
+    Column("bio", String),
+    Column("profile_photo_url", String),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "posts", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String, nullable=False),
+    Column("content", Text, nullable=False),
+    Column("created_at", DateTime),
+    Column("is_anonymous", Boolean),
+    Column("upvotes", Integer),
+    Column("downvotes", Integer),
+    Column("comments_count", Integer),
+    Column("share_count", Integer),
+    Column("popularity_score", Integer, nullable=False, server_default="0"),
+    Column("author_id", Integer, ForeignKey("users.id")),
+    Column("department", String, nullable=False, index=True),
+    Column("tags", String),
+    Column("type", String),
+    Column("is_pinned", Boolean),
+    Column("pinned_until", DateTime),
+    Column("media_url", String),
+    Column("media_public_id", String),
+    Column("media_type", String),
+    Column("search_vector", TSVECTOR().with_variant(Text(), "sqlite")),
+    Index("ix_posts_created_at_id", "created_at", "id"),
+    Index("ix_posts_department_created_at_id", "department", "created_at", "id"),
+    Index("ix_posts_popularity_score_created_at", "popularity_score", "created_at"),
+    Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+)
+
+Table(
+    "post_tags", metadata,
+    Column("post_id", Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False),
+    Column("tag", String, nullable=False),
+    PrimaryKeyConstraint("post_id", "tag"),
+    Index("ix_post_tags_tag_post_id", "tag", "post_id"),
+)
+
+Table(
+    "comments", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("content", Text, nullable=False),
+    Column("created_at", DateTime),
+    Column("upvotes", Integer),
+    Column("downvotes", Integer),
+    Column("post_id", Integer, ForeignKey("posts.id"), nullable=False),
+    Column("author_id", Integer, ForeignKey("users.id")),
+    Column("parent_id", Integer, ForeignKey("comments.id")),
+    Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+    Index("ix_comments_parent_id_created_at_id", "parent_id", "created_at", "id"),
+)
+
+Table(
+    "reactions", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("post_id", Integer, ForeignKey("posts.id")),
+    Column("comment_id", Integer, ForeignKey("comments.id")),
+    Column("emoji", String, nullable=False),
+    Column("created_at", DateTime),
+    UniqueConstraint("user_id", "post_id", "emoji", name="unique_user_post_emoji"),
+    UniqueConstraint("user_id", "comment_id", "emoji", name="unique_user_comment_emoji"),
+    Index("ix_reactions_post_id_emoji_user_id", "post_id", "emoji", "user_id"),
+    Index("ix_reactions_comment_id_emoji_user_id", "comment_id", "emoji", "user_id"),
+)
+
+Table(
+    "votes", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("post_id", Integer, ForeignKey("posts.id")),
+    Column("comment_id", Integer, ForeignKey("comments.id")),
+    Column("vote_type", Integer, nullable=False),
+    UniqueConstraint("user_id", "post_id", name="unique_user_post_vote"),
+    UniqueConstraint("user_id", "comment_id", name="unique_user_comment_vote"),
+    Index("ix_votes_post_id", "post_id", postgresql_where=text("post_id IS NOT NULL")),
+    Index("ix_votes_comment_id", "comment_id", postgresql_where=text("comment_id IS NOT NULL")),
+)
+
+Table(
+    "notifications", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("recipient_id", Integer, ForeignKey("users.id"), index=True),
+    Column("sender_id", Integer, ForeignKey("users.id")),
+    Column("type", String, index=True),
+    Column("title", String),
+    Column("message", String),
+    Column("reference_id", Integer),
+    Column("reference_type", String),
+    Column("is_read", Boolean),
+    Column("created_at", DateTime),
+    Column("bucket", DateTime),
+    Column("actor_ids", ARRAY(Integer).with_variant(JSON(), "sqlite")),
+    Column("actor_count", Integer, nullable=False, server_default="1"),
+    UniqueConstraint(
+        "recipient_id", "type", "reference_type", "reference_id", "bucket", name="uq_notifications_aggregate"
+    ),
+    Index("ix_notifications_recipient_unread", "recipient_id", postgresql_where=text("is_read IS NOT TRUE")),
+    Index("ix_notifications_recipient_created_at_id", "recipient_id", "created_at", "id"),
+)
+
+Table(
+    "notifications_archive", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("recipient_id", Integer, index=True),
+    Column("sender_id", Integer),
+    Column("type", String),
+    Column("title", String),
+    Column("message", String),
+    Column("reference_id", Integer),
+    Column("reference_type", String),
+    Column("is_read", Boolean),
+    Column("created_at", DateTime),
+    Column("bucket", DateTime),
+    Column("actor_ids", ARRAY(Integer).with_variant(JSON(), "sqlite")),
+    Column("actor_count", Integer, nullable=False, server_default="1"),
+    Column("archived_at", DateTime, nullable=False, index=True),
+)
+
+Table(
+    "audit_logs", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("action", String, nullable=False),
+    Column("admin_id", Integer, ForeignKey("users.id")),
+    Column("target_id", Integer),
+    Column("target_type", String),
+    Column("details", String),
+    Column("timestamp", DateTime(timezone=True), server_default=func.now()),
+    Index("ix_audit_logs_timestamp", "timestamp"),
+)
+
+Table(
+    "announcements", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("sender_id", Integer, ForeignKey("users.id")),
+    Column("title", String),
+    Column("message", String),
+    Column("created_at", DateTime, index=True),
+)
+
+Table(
+    "announcement_read_state", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("read_through_id", Integer, nullable=False),
+)
+
+Table(
+    "announcement_reads", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("announcement_id", Integer, ForeignKey("announcements.id", ondelete="CASCADE"), primary_key=True),
+)
+
+Table(
+    "rate_limits", metadata,
+    Column("key", String, primary_key=True),
+    Column("window_start", BigInteger, nullable=False),
+    Column("prev_count", Integer, nullable=False),
+    Column("curr_count", Integer, nullable=False),
+    Column("expires_at", BigInteger, nullable=False, index=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    metadata.create_all(bind=conn)
@@ -0,0 +1,57 @@
+"""
+Columns added to users, posts and comments before versioned migrations.
+
+Replaces fix_db_schema.py, migrate_db.py and the db_migration_*.py scripts
+(enrollment number, username, profile fields, OAuth, anonymous posts, votes,
+comment counts, media).
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.migrations import has_column
+
+POSTGRES_ONLY = True
+
+COLUMNS = {
+    "users": [
+        ("enrollment_number", "VARCHAR"),
+        ("username", "VARCHAR"),
+        ("full_name", "VARCHAR"),
+        ("department", "VARCHAR"),
+        ("role", "VARCHAR DEFAULT 'student'"),
+        ("bio", "VARCHAR"),
+        ("profile_photo_url", "VARCHAR"),
+        ("created_at", "TIMESTAMP DEFAULT NOW()"),
+        ("auth_provider", "VARCHAR DEFAULT 'local'"),
+    ],
+    "posts": [
+        ("is_anonymous", "BOOLEAN DEFAULT false"),
+        ("upvotes", "INTEGER DEFAULT 0"),
+        ("downvotes", "INTEGER DEFAULT 0"),
+        ("media_url", "VARCHAR"),
+        ("media_public_id", "VARCHAR"),
+        ("media_type", "VARCHAR"),
+    ],
+    "comments": [
+        ("upvotes", "INTEGER DEFAULT 0"),
+        ("downvotes", "INTEGER DEFAULT 0"),
+    ],
+}
+
+
+def upgrade(conn: Connection) -> None:
+    for table, columns in COLUMNS.items():
+        for name, ddl in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {name} {ddl}"))
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_enrollment_number ON users (enrollment_number)"))
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username)"))
+
+    # OAuth users have no password
+    conn.execute(text("ALTER TABLE users ALTER COLUMN hashed_password DROP NOT NULL"))
+
+    if not has_column(conn, "posts", "comments_count"):
+        conn.execute(text("ALTER TABLE posts ADD COLUMN comments_count INTEGER DEFAULT 0"))
+        conn.execute(text("""
+            UPDATE posts
+            SET comments_count = (SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id)
+        """))
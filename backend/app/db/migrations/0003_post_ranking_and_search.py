@@ -0,0 +1,37 @@
+"""
+Pinning, popularity score and full-text search columns on posts.
+
+Replaces scripts/add_pinned_column.py, add_popularity_score.py and
+add_post_search.py. Backfills run only when the column is new.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.migrations import has_column
+from app.db.search import COMMENTS_SEARCH_TRIGGER, POSTS_SEARCH_TRIGGER
+
+POSTGRES_ONLY = True
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text("ALTER TABLE posts ADD COLUMN IF NOT EXISTS is_pinned BOOLEAN DEFAULT FALSE"))
+    conn.execute(text("ALTER TABLE posts ADD COLUMN IF NOT EXISTS pinned_until TIMESTAMP"))
+
+    if not has_column(conn, "posts", "popularity_score"):
+        conn.execute(text("ALTER TABLE posts ADD COLUMN popularity_score INTEGER NOT NULL DEFAULT 0"))
+        # Popularity = (Net Votes) + (Comments * 2) + (Shares * 3), as crud.post maintains it
+        conn.execute(text("""
+            UPDATE posts
+            SET popularity_score = (COALESCE(upvotes, 0) - COALESCE(downvotes, 0))
+                                 + COALESCE(comments_count, 0) * 2
+                                 + COALESCE(share_count, 0) * 3
+        """))
+
+    # Triggers are CREATE OR REPLACE / DROP IF EXISTS, so always safe to (re)install
+    backfill_search = not has_column(conn, "posts", "search_vector")
+    conn.execute(text("ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+    for statement in POSTS_SEARCH_TRIGGER + COMMENTS_SEARCH_TRIGGER:
+        conn.exec_driver_sql(statement)
+    if backfill_search:
+        # Touching title fires the posts trigger (title + content + comments)
+        conn.execute(text("UPDATE posts SET title = title"))
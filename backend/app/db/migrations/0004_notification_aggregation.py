@@ -0,0 +1,25 @@
+"""
+Aggregation columns and unique target on notifications.
+
+Replaces scripts/add_notification_aggregation.py. Existing rows keep bucket
+NULL, so they never collide with aggregated ones.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+POSTGRES_ONLY = True
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text("ALTER TABLE notifications ADD COLUMN IF NOT EXISTS bucket TIMESTAMP"))
+    conn.execute(text("ALTER TABLE notifications ADD COLUMN IF NOT EXISTS actor_ids INTEGER[]"))
+    conn.execute(text("ALTER TABLE notifications ADD COLUMN IF NOT EXISTS actor_count INTEGER NOT NULL DEFAULT 1"))
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_notifications_aggregate') THEN
+                ALTER TABLE notifications ADD CONSTRAINT uq_notifications_aggregate
+                UNIQUE (recipient_id, type, reference_type, reference_id, bucket);
+            END IF;
+        END $$
+    """))
@@ -0,0 +1,57 @@
+"""
+Collapse legacy per-user announcement notifications into shared announcements.
+
+Replaces scripts/migrate_announcements.py. Individual read state is kept as
+announcement_reads marks, and users.created_at is moved back where needed so
+every legacy announcement stays visible. A no-op once no announcement
+notifications remain.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+POSTGRES_ONLY = True
+
+
+def upgrade(conn: Connection) -> None:
+    # One announcement per (sender, title, message, send time)
+    conn.execute(text("""
+        INSERT INTO announcements (sender_id, title, message, created_at)
+        SELECT sender_id, title, message, MIN(created_at)
+        FROM notifications
+        WHERE type = 'announcement'
+        GROUP BY sender_id, title, message, date_trunc('minute', created_at)
+        ORDER BY MIN(created_at)
+    """))
+    conn.execute(text("""
+        INSERT INTO announcement_reads (user_id, announcement_id)
+        SELECT DISTINCT n.recipient_id, a.id
+        FROM notifications n
+        JOIN announcements a
+          ON a.sender_id IS NOT DISTINCT FROM n.sender_id
+         AND a.title IS NOT DISTINCT FROM n.title
+         AND a.message IS NOT DISTINCT FROM n.message
+         AND date_trunc('minute', a.created_at) = date_trunc('minute', n.created_at)
+        WHERE n.type = 'announcement' AND n.is_read = true
+        ON CONFLICT DO NOTHING
+    """))
+    # Shared announcements are shown from users.created_at on, but legacy databases
+    # backfilled that column with the time of its ADD COLUMN. Move it back to the
+    # earliest announcement a user actually received so none of them disappear.
+    conn.execute(text("""
+        UPDATE users u
+        SET created_at = received.first_at
+        FROM (
+            SELECT n.recipient_id, MIN(a.created_at) AS first_at
+            FROM notifications n
+            JOIN announcements a
+              ON a.sender_id IS NOT DISTINCT FROM n.sender_id
+             AND a.title IS NOT DISTINCT FROM n.title
+             AND a.message IS NOT DISTINCT FROM n.message
+             AND date_trunc('minute', a.created_at) = date_trunc('minute', n.created_at)
+            WHERE n.type = 'announcement'
+            GROUP BY n.recipient_id
+        ) received
+        WHERE u.id = received.recipient_id
+          AND (u.created_at IS NULL OR u.created_at > received.first_at)
+    """))
+    conn.execute(text("DELETE FROM notifications WHERE type = 'announcement'"))
@@ -0,0 +1,21 @@
+"""
+Backfill post_tags from the comma-separated posts.tags column.
+
+Replaces scripts/add_post_tags.py (the table itself comes from the baseline).
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+POSTGRES_ONLY = True
+
+
+def upgrade(conn: Connection) -> None:
+    # Same normalization as crud.post.parse_tags: trimmed, lowercased, no empties
+    conn.execute(text("""
+        INSERT INTO post_tags (post_id, tag)
+        SELECT DISTINCT p.id, lower(trim(t.tag))
+        FROM posts p
+        CROSS JOIN LATERAL unnest(string_to_array(p.tags, ',')) AS t(tag)
+        WHERE p.tags IS NOT NULL AND trim(t.tag) <> ''
+        ON CONFLICT DO NOTHING
+    """))
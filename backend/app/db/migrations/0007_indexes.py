@@ -0,0 +1,44 @@
+"""
+Indexes for the feed, tags, search, comments, reactions, votes, notifications and audit log.
+
+Replaces scripts/add_department_index.py, add_feed_keyset_index.py,
+add_unread_index.py, add_notification_list_index.py and
+add_hot_path_indexes.py. Built CONCURRENTLY so writes keep flowing while big
+tables are indexed; a failed build leaves an INVALID index that IF NOT EXISTS
+would skip, so those are dropped and rebuilt.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+POSTGRES_ONLY = True
+TRANSACTIONAL = False  # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+
+INDEXES = {
+    "ix_posts_department": "posts (department)",
+    "ix_posts_created_at_id": "posts (created_at, id)",
+    "ix_posts_department_created_at_id": "posts (department, created_at, id)",
+    "ix_posts_popularity_score_created_at": "posts (popularity_score, created_at)",
+    "ix_posts_search_vector": "posts USING gin (search_vector)",
+    "ix_post_tags_tag_post_id": "post_tags (tag, post_id)",
+    "ix_comments_post_id_created_at_id": "comments (post_id, created_at, id)",
+    "ix_comments_parent_id_created_at_id": "comments (parent_id, created_at, id)",
+    "ix_reactions_post_id_emoji_user_id": "reactions (post_id, emoji, user_id)",
+    "ix_reactions_comment_id_emoji_user_id": "reactions (comment_id, emoji, user_id)",
+    "ix_votes_post_id": "votes (post_id) WHERE post_id IS NOT NULL",
+    "ix_votes_comment_id": "votes (comment_id) WHERE comment_id IS NOT NULL",
+    # Must match the predicate used by crud.notification.unread_count_query
+    "ix_notifications_recipient_unread": "notifications (recipient_id) WHERE is_read IS NOT TRUE",
+    "ix_notifications_recipient_created_at_id": "notifications (recipient_id, created_at, id)",
+    "ix_audit_logs_timestamp": "audit_logs (timestamp)",
+}
+
+
+def upgrade(conn: Connection) -> None:
+    for name, definition in INDEXES.items():
+        invalid = conn.execute(text("""
+            SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = :name AND NOT i.indisvalid
+        """), {"name": name}).first()
+        if invalid:
+            conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+        conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}"))
@@ -0,0 +1,17 @@
+"""
+Create pubsub_spill for bus messages larger than the NOTIFY payload limit.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, MetaData, Table, Text, func
+from sqlalchemy.engine import Connection
+
+# Frozen copy of app.models.pubsub.PubSubSpill as of this migration
+pubsub_spill = Table(
+    "pubsub_spill", MetaData(),
+    Column("id", BigInteger, primary_key=True),
+    Column("payload", Text, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now(), index=True),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    pubsub_spill.create(conn, checkfirst=True)
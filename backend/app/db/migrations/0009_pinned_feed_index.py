@@ -0,0 +1,26 @@
+"""
+Index the pinned section of the feed.
+
+read_posts serves pinned posts first as their own (created_at, id) range;
+without this partial index that section walks ix_posts_created_at_id and
+filters out every unpinned post on the way. Built CONCURRENTLY, like 0007.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+POSTGRES_ONLY = True
+TRANSACTIONAL = False  # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+
+NAME = "ix_posts_pinned_created_at_id"
+
+
+def upgrade(conn: Connection) -> None:
+    invalid = conn.execute(text("""
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = :name AND NOT i.indisvalid
+    """), {"name": NAME}).first()
+    if invalid:
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{NAME}"'))
+    conn.execute(text(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {NAME} ON posts (created_at, id) WHERE is_pinned IS TRUE"
+    ))
@@ -0,0 +1,157 @@
+"""
+Versioned schema migrations.
+
+Every module in this package named NNNN_<name>.py is one migration: its
+docstring says what it does and upgrade(conn) applies it. scripts/migrate.py
+applies the pending ones in order, once per deploy, before any worker starts;
+applied versions are recorded in schema_migrations. Workers never run DDL.
+
+Rules for new migrations:
+- Never edit a migration that has shipped; add the next number instead.
+- Never build schema from app.models: they keep changing, so a replay would
+  create later objects early. Spell the DDL out (SQL, or a frozen Core Table).
+- Keep upgrades idempotent (IF NOT EXISTS, ON CONFLICT DO NOTHING, backfill
+  only what is missing). Databases from before this runner were built by
+  create_all plus one-off scripts, so their first run replays every migration
+  over whatever is already there.
+- POSTGRES_ONLY = True: recorded as applied but skipped on other databases
+  (local SQLite).
+- TRANSACTIONAL = False: upgrade(conn) gets an AUTOCOMMIT connection, e.g. for
+  CREATE INDEX CONCURRENTLY. Otherwise a migration and its version row commit
+  together, so a failure leaves nothing half-applied.
+"""
+import importlib
+import logging
+import pkgutil
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Any 64-bit key unique to this app; serializes concurrent runners
+_LOCK_KEY = 0x6C6F6F70  # "loop"
+_LOCK_POLL_SECONDS = 2
+
+# Kept off Base.metadata: the models (and create_all) never see it
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    """For upgrades that backfill only when they add the column (PostgreSQL)."""
+    return conn.execute(text(
+        "SELECT 1 FROM information_schema.columns WHERE table_name = :table AND column_name = :column"
+    ), {"table": table, "column": column}).first() is not None
+
+
+class Migration:
+    __slots__ = ("version", "name", "description", "upgrade", "postgres_only", "transactional")
+
+    def __init__(self, module, version: int, name: str):
+        self.version = version
+        self.name = name
+        self.description = (module.__doc__ or name).strip().splitlines()[0]
+        self.upgrade: Callable[[Connection], None] = module.upgrade
+        self.postgres_only = getattr(module, "POSTGRES_ONLY", False)
+        self.transactional = getattr(module, "TRANSACTIONAL", True)
+
+
+def load_migrations() -> List[Migration]:
+    """All migrations in this package, ordered by version."""
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        prefix, _, name = info.name.partition("_")
+        if not prefix.isdigit():
+            continue
+        module = importlib.import_module(f"{__name__}.{info.name}")
+        migrations.append(Migration(module, int(prefix), name))
+    migrations.sort(key=lambda m: m.version)
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {__name__}: {versions}")
+    return migrations
+
+
+def applied_versions(conn: Connection, create: bool = False) -> set:
+    if create:
+        schema_migrations.create(conn, checkfirst=True)
+    elif not inspect(conn).has_table(schema_migrations.name):
+        return set()
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending(engine: Engine) -> List[Migration]:
+    """Migrations not yet applied to `engine`'s database. Read-only."""
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+    return [m for m in load_migrations() if m.version not in done]
+
+
+def _acquire_lock(conn: Connection) -> None:
+    """
+    Take the session-level advisory lock, polling rather than blocking.
+
+    A blocked pg_advisory_lock() waits inside an open transaction, and CREATE
+    INDEX CONCURRENTLY in the run holding the lock waits for every open
+    transaction to end: the two would wait on each other forever. Between
+    attempts this connection is idle, outside any transaction.
+    """
+    waiting = False
+    while not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": _LOCK_KEY}).scalar():
+        conn.commit()
+        if not waiting:
+            logger.info("Waiting for another migration run to finish")
+            waiting = True
+        time.sleep(_LOCK_POLL_SECONDS)
+    conn.commit()
+
+
+def upgrade(engine: Engine, on_apply: Optional[Callable[[Migration, bool], None]] = None) -> List[Migration]:
+    """
+    Apply every pending migration in order. Returns the migrations applied.
+
+    On PostgreSQL an advisory lock makes concurrent runs (two deploys, a manual
+    run during a deploy) wait for each other instead of racing; the loser then
+    finds nothing left to do. on_apply(migration, skipped) is called after each.
+    """
+    is_postgres = engine.dialect.name == "postgresql"
+    applied = []
+    with engine.connect() as lock_conn:
+        if is_postgres:
+            _acquire_lock(lock_conn)
+        try:
+            with engine.begin() as conn:
+                done = applied_versions(conn, create=True)
+
+            for migration in load_migrations():
+                if migration.version in done:
+                    continue
+                skipped = migration.postgres_only and not is_postgres
+                if not skipped and not migration.transactional:
+                    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                        migration.upgrade(conn)
+                with engine.begin() as conn:
+                    if not skipped and migration.transactional:
+                        migration.upgrade(conn)
+                    conn.execute(schema_migrations.insert().values(
+                        version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+                    ))
+                applied.append(migration)
+                logger.info(f"Applied migration {migration.version:04d}_{migration.name}"
+                            f"{' (skipped: PostgreSQL only)' if skipped else ''}")
+                if on_apply:
+                    on_apply(migration, skipped)
+        finally:
+            if is_postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+                lock_conn.commit()
+    return applied
@@ -0,0 +1,145 @@
+"""
+Connection pool sizing and telemetry.
+
+Pool sizes are derived from a deployment-wide connection budget instead of
+being hardcoded per process, and both engines use instrumented pools that
+record how long checkouts wait and how often connections are opened/closed.
+"""
+import threading
+import time
+from typing import Tuple
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+def pool_limits(budget: int, workers: int, reserved_per_worker: int = 0) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """
+    Split a deployment-wide connection budget into per-process pool limits.
+
+    budget:              max connections all workers together may hold
+    workers:             gunicorn worker processes sharing that budget
+    reserved_per_worker: connections each worker opens outside the pools (pub/sub)
+
+    Returns ((pool_size, max_overflow) for the sync engine, same for the async
+    engine). The sync engine gets two thirds of a worker's share since most
+    routes are sync; a third of each engine's share is burst overflow, so
+    idle workers hold fewer connections than the budget allows.
+
+    Raises ValueError when the budget can't give every worker the minimum
+    (one connection per engine plus the reserved ones) rather than silently
+    exceeding it.
+    """
+    workers = max(1, workers)
+    per_worker = max(2, budget // workers - reserved_per_worker)
+    sync_share = max(1, (per_worker * 2 + 2) // 3)
+    async_share = max(1, per_worker - sync_share)
+
+    needed = workers * (sync_share + async_share + reserved_per_worker)
+    if needed > budget:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={budget} is too small for {workers} worker(s): each needs at least "
+            f"{sync_share + async_share + reserved_per_worker} connections ({needed} in total). "
+            f"Raise DB_MAX_CONNECTIONS or lower WEB_CONCURRENCY."
+        )
+
+    def split(share: int) -> Tuple[int, int]:
+        overflow = share // 3
+        return share - overflow, overflow
+
+    return split(sync_share), split(async_share)
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    # Pool events fire on whichever thread opens/closes the connection
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_close(self) -> None:
+        with self._lock:
+            self.closes += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(0, pool.overflow()),
+                "checkouts": self.checkouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+            }
+
+
+class _InstrumentedMixin:
+    """Times every checkout; _do_get blocks while the pool is exhausted."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        _listen(self)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.record_wait(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_InstrumentedMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _listen(pool) -> None:
+    stats = pool.stats
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.record_connect()
+
+    @event.listens_for(pool, "close")
+    def _on_close(dbapi_connection, connection_record):
+        stats.record_close()
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        stats.record_invalidation()
+
+
+def pool_snapshot(engine) -> dict:
+    if engine is None:
+        return None
+    pool = engine.pool
+    stats = getattr(pool, "stats", None)
+    if stats is None:
+        # Non-queue pools (tests, SQLite) have no telemetry
+        return {"pool": type(pool).__name__}
+    return stats.snapshot(pool)
@@ -0,0 +1,81 @@
+"""
+Full-text search maintenance for posts.search_vector.
+
+The tsvector is kept current by triggers, so every write path (ORM, raw SQL,
+scripts) stays indexed without application code:
+
+- posts:    title (weight A) and content (B) plus all comment bodies (C) are
+            recomputed on INSERT and on UPDATE OF title/content
+- comments: a new comment is appended to its post's vector (no re-parse of
+            the thread); edits and deletes trigger a recompute of that post
+
+Installed by create_all (after_create events in the models) and by migration
+0003_post_ranking_and_search for existing databases. PostgreSQL only.
+"""
+
+SEARCH_CONFIG = "english"
+
+POSTS_SEARCH_TRIGGER = [
+    f"""
+    CREATE OR REPLACE FUNCTION posts_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.content, '')), 'B') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+                (SELECT string_agg(c.content, ' ') FROM comments c WHERE c.post_id = NEW.id), ''
+            )), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS posts_search_vector_trigger ON posts",
+    """
+    CREATE TRIGGER posts_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON posts
+    FOR EACH ROW EXECUTE FUNCTION posts_search_vector_update()
+    """,
+]
+
+COMMENTS_SEARCH_TRIGGER = [
+    f"""
+    CREATE OR REPLACE FUNCTION comments_search_vector_append() RETURNS trigger AS $$
+    BEGIN
+        UPDATE posts
+        SET search_vector = coalesce(search_vector, ''::tsvector) ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.content, '')), 'C')
+        WHERE id = NEW.post_id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION comments_search_vector_refresh() RETURNS trigger AS $$
+    BEGIN
+        -- Touching title fires posts_search_vector_trigger, which rebuilds the vector
+        UPDATE posts SET title = title WHERE id = OLD.post_id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS comments_search_vector_insert ON comments",
+    """
+    CREATE TRIGGER comments_search_vector_insert
+    AFTER INSERT ON comments
+    FOR EACH ROW EXECUTE FUNCTION comments_search_vector_append()
+    """,
+    "DROP TRIGGER IF EXISTS comments_search_vector_change ON comments",
+    """
+    CREATE TRIGGER comments_search_vector_change
+    AFTER DELETE OR UPDATE OF content ON comments
+    FOR EACH ROW EXECUTE FUNCTION comments_search_vector_refresh()
+    """,
+]
+
+
+def install_on_create(table, statements) -> None:
+    """Run `statements` right after create_all creates `table` (PostgreSQL only)."""
+    from sqlalchemy import DDL, event
+
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -4,12 +4,18 @@ Database session management with proper lifecycle handling.
 This module provides:
 - SQLAlchemy engine with connection pooling
 - Session factory for database transactions
+- Async engine and session factory (asyncpg) for `async def` routes
 - Base class for ORM models
-- Database dependency for FastAPI routes
+- Database dependencies for FastAPI routes
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
+
+from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_limits
 
 # Create Base for models (no engine binding here!)
 Base = declarative_base()
@@ -17,6 +23,24 @@ Base = declarative_base()
 # Global engine and session factory (will be initialized in startup event)
 engine = None
 SessionLocal = None
+async_engine = None
+AsyncSessionLocal = None
+
+
+def async_database_url(database_url: str) -> Optional[str]:
+    """
+    Map a PostgreSQL URL onto the asyncpg driver.
+    
+    Returns None for other databases (no async engine is created for them).
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "postgresql":
+        return None
+    query = dict(url.query)
+    # asyncpg spells libpq's sslmode as ssl
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
 
 
 def init_db(database_url: str) -> None:
@@ -28,14 +52,24 @@ def init_db(database_url: str) -> None:
     Args:
         database_url: PostgreSQL connection string
     """
-    global engine, SessionLocal
+    global engine, SessionLocal, async_engine, AsyncSessionLocal
+    
+    # Per-worker pool limits from the deployment-wide connection budget;
+    # the postgres pub/sub backend holds two connections of its own
+    reserved = 2 if settings.REALTIME_BACKEND == "postgres" else 0
+    (sync_size, sync_overflow), (async_size, async_overflow) = pool_limits(
+        settings.DB_MAX_CONNECTIONS, settings.WEB_CONCURRENCY, reserved
+    )
     
     # Create engine with connection pooling
     engine = create_engine(
         database_url,
-        pool_pre_ping=True,  # Verify connections before using
-        pool_size=5,         # Max connections in pool
-        max_overflow=10,     # Max extra connections
+        poolclass=InstrumentedQueuePool,  # Checkout wait / churn telemetry
+        pool_size=sync_size,
+        max_overflow=sync_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
         echo=False,          # Set to True for SQL logging
     )
     
@@ -45,21 +79,49 @@ def init_db(database_url: str) -> None:
         autoflush=False,
         bind=engine
     )
+    
+    # Async engine for `async def` routes, so they never block the event loop
+    async_url = async_database_url(database_url)
+    if async_url:
+        async_engine = create_async_engine(
+            async_url,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=async_size,
+            max_overflow=async_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            echo=False,
+        )
+        AsyncSessionLocal = async_sessionmaker(
+            bind=async_engine,
+            autoflush=False,
+            expire_on_commit=False,  # Lazy refresh would need IO outside an await
+        )
 
 
-def create_tables() -> None:
-    """
-    Create all database tables.
-    
-    This should ONLY be called in FastAPI startup event after init_db().
-    Imports models here to avoid circular dependencies.
-    """
-    # Import models here to register them with Base
+def import_models() -> None:
+    """Import every model module so all tables are registered on Base.metadata."""
     from app.models import user  # noqa: F401
     from app.models import post  # noqa: F401
     from app.models import comment  # noqa: F401
     from app.models import reaction  # noqa: F401
+    from app.models import vote  # noqa: F401
+    from app.models import notification  # noqa: F401
     from app.models import audit_log # noqa: F401
+    from app.models import announcement  # noqa: F401
+    from app.models import rate_limit  # noqa: F401
+    from app.models import pubsub  # noqa: F401
+
+
+def create_tables() -> None:
+    """
+    Create all database tables straight from the models.
+    
+    For throwaway databases (tests, local SQLite) only. Real databases are
+    built and upgraded by the versioned migrations: python scripts/migrate.py
+    """
+    import_models()
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
@@ -76,6 +138,16 @@ def close_db() -> None:
         engine.dispose()
 
 
+async def close_async_db() -> None:
+    """
+    Close async database connections.
+    
+    This should be called in FastAPI shutdown event.
+    """
+    if async_engine:
+        await async_engine.dispose()
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Database session dependency for FastAPI routes.
@@ -96,3 +168,22 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency for `async def` routes.
+    
+    Usage:
+        @router.post("/votes")
+        async def cast_vote(db: AsyncSession = Depends(get_async_db)):
+            await db.execute(...)
+    
+    Yields:
+        Async database session
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database not initialized. Call init_db() with a PostgreSQL URL first.")
+    
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -10,12 +10,17 @@ This module sets up:
 """
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.db.session import init_db, create_tables, close_db
+from app.db import migrations
+from app.db.session import init_db, close_db, close_async_db
+from app.core.pubsub import bus, create_backend
+from app.core.vote_buffer import vote_buffer
+from app.core.notification_push import notification_pusher
 from app.api import auth
+from app.api.deps import get_current_admin
 
 # Configure logging
 logging.basicConfig(
@@ -31,8 +36,8 @@ async def lifespan(app: FastAPI):
     Application lifespan manager.
     
     Handles startup and shutdown events:
-    - Startup: Initialize database connection and create tables
-    - Shutdown: Close database connections
+    - Startup: Initialize database connection, check the schema version, join the pub/sub bus
+    - Shutdown: Leave the bus and close database connections
     """
     # Startup
     logger.info("Starting application...")
@@ -49,9 +54,24 @@ async def lifespan(app: FastAPI):
         init_db(db_url)
         logger.info("Database engine initialized")
         
-        # Create tables
-        create_tables()
-        logger.info("Database tables created/verified")
+        # Schema changes are applied once per deploy by scripts/migrate.py, never by workers
+        from app.db import session as db_session
+        behind = migrations.pending(db_session.engine)
+        if behind:
+            logger.warning(
+                f"Database schema is {len(behind)} migration(s) behind "
+                f"(next: {behind[0].version:04d}_{behind[0].name}); run scripts/migrate.py"
+            )
+        
+        # Real-time fan-out across workers
+        await bus.start(create_backend(settings.REALTIME_BACKEND, db_url))
+        logger.info(f"Pub/sub bus started ({settings.REALTIME_BACKEND})")
+        
+        # Write-behind vote counters (no-op unless VOTE_WRITE_BEHIND)
+        vote_buffer.start()
+        
+        # Coalesced notification pushes
+        notification_pusher.start()
         
         logger.info("Application startup complete")
     except Exception as e:
@@ -62,7 +82,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application...")
+    await vote_buffer.stop()  # Final flush of pending vote counters
+    await notification_pusher.stop()
+    await bus.stop()
     close_db()
+    await close_async_db()
     logger.info("Database connections closed")
     logger.info("Application shutdown complete")
 
@@ -87,6 +111,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset paging cursor
 )
 
 
@@ -102,6 +127,35 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/realtime", tags=["health"])
+def realtime_stats():
+    """
+    WebSocket delivery counters for this worker.
+    
+    Returns:
+        {"connections", "users", "delivered", "dropped", "evicted"}
+    """
+    from app.core.socket_manager import manager
+    return manager.stats
+
+
+@app.get("/health/db-pool", tags=["health"], dependencies=[Depends(get_current_admin)])
+def db_pool_stats():
+    """
+    Connection pool telemetry for this worker. Admin only: it exposes pool sizing.
+    
+    Returns:
+        {"sync": {...}, "async": {...}} with size, checked_out, overflow,
+        checkouts, wait_avg_ms, wait_max_ms, connects, closes, invalidations
+    """
+    from app.db import session as db_session
+    from app.db.pool import pool_snapshot
+    return {
+        "sync": pool_snapshot(db_session.engine),
+        "async": pool_snapshot(db_session.async_engine),
+    }
+
+
 # Include API routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 from app.api import posts, comments, reactions, users, votes
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.db.session import Base
+
+class Announcement(Base):
+    """
+    Campus-wide announcement, stored once for all users.
+    
+    Per-user read state is kept compactly in AnnouncementReadState (a
+    read-through watermark) plus AnnouncementRead (individual reads above it).
+    """
+    __tablename__ = "announcements"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sender_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    title = Column(String)
+    message = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    sender = relationship("User")
+
+class AnnouncementReadState(Base):
+    """Every announcement with id <= read_through_id is read for this user."""
+    __tablename__ = "announcement_read_state"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    read_through_id = Column(Integer, default=0, nullable=False)
+
+class AnnouncementRead(Base):
+    """Individually read announcements above the user's watermark."""
+    __tablename__ = "announcement_reads"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    announcement_id = Column(Integer, ForeignKey("announcements.id", ondelete="CASCADE"), primary_key=True)
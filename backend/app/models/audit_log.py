@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.db.session import Base
 
@@ -12,3 +12,8 @@ class AuditLog(Base):
     target_type = Column(String) # "post", "comment"
     details = Column(String, nullable=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Admin review: newest entries first
+        Index("ix_audit_logs_timestamp", "timestamp"),
+    )
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
+from app.db.search import COMMENTS_SEARCH_TRIGGER, install_on_create
 
 class Comment(Base):
     __tablename__ = "comments"
@@ -26,6 +27,16 @@ class Comment(Base):
     # Reactions relationship
     reactions = relationship("Reaction", backref="comment", foreign_keys="Reaction.comment_id")
 
+    __table_args__ = (
+        # Whole thread / top-level page: post_id = ? ORDER BY created_at, id
+        Index("ix_comments_post_id_created_at_id", "post_id", "created_at", "id"),
+        # Reply levels and /replies: parent_id IN (...) ORDER BY created_at, id
+        Index("ix_comments_parent_id_created_at_id", "parent_id", "created_at", "id"),
+    )
+
+# Comment bodies are part of their post's search_vector
+install_on_create(Comment.__table__, COMMENTS_SEARCH_TRIGGER)
+
 # Add reactions relationship to Post as well
 from app.models.post import Post
 Post.reactions = relationship("Reaction", backref="post", foreign_keys="Reaction.post_id")
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, JSON, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.session import Base
@@ -17,5 +18,43 @@ class Notification(Base):
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Aggregation (crud.notification.add_event): one row per (recipient, type, reference, time bucket)
+    bucket = Column(DateTime, nullable=True) # Start of the aggregation window; NULL = never aggregated
+    actor_ids = Column(ARRAY(Integer).with_variant(JSON(), "sqlite"), nullable=True) # Distinct senders in the window
+    actor_count = Column(Integer, default=1, nullable=False, server_default="1")
+
     recipient = relationship("User", foreign_keys=[recipient_id], backref="notifications_received")
     sender = relationship("User", foreign_keys=[sender_id], backref="notifications_sent")
+
+    __table_args__ = (
+        # Unread badge: counts only touch the (small) unread part of a user's notifications
+        Index("ix_notifications_recipient_unread", "recipient_id", postgresql_where=text("is_read IS NOT TRUE")),
+        # Notification list: newest first per recipient, (created_at, id) keyset paging
+        Index("ix_notifications_recipient_created_at_id", "recipient_id", "created_at", "id"),
+        # Aggregation target: concurrent events upsert into the same row
+        UniqueConstraint("recipient_id", "type", "reference_type", "reference_id", "bucket", name="uq_notifications_aggregate"),
+    )
+
+
+class NotificationArchive(Base):
+    """
+    Notifications moved out of the hot table by the retention policy
+    (crud.retention). Same columns plus archived_at; nothing reads it on the
+    request path.
+    """
+    __tablename__ = "notifications_archive"
+
+    id = Column(Integer, primary_key=True)  # Original notifications.id
+    recipient_id = Column(Integer, index=True)
+    sender_id = Column(Integer, nullable=True)
+    type = Column(String)
+    title = Column(String)
+    message = Column(String)
+    reference_id = Column(Integer, nullable=True)
+    reference_type = Column(String, nullable=True)
+    is_read = Column(Boolean)
+    created_at = Column(DateTime)
+    bucket = Column(DateTime, nullable=True)
+    actor_ids = Column(ARRAY(Integer).with_variant(JSON(), "sqlite"), nullable=True)
+    actor_count = Column(Integer, nullable=False, server_default="1")
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.db.session import Base
+from app.db.search import POSTS_SEARCH_TRIGGER, install_on_create
 
 class Post(Base):
     __tablename__ = "posts"
@@ -20,13 +22,16 @@ class Post(Base):
     comments_count = Column(Integer, default=0)
     share_count = Column(Integer, default=0)  # Track share popularity
     
+    # Trending score (Cached): kept in step with the counters above by crud.post.bump_popularity
+    popularity_score = Column(Integer, default=0, nullable=False, server_default="0")
+    
     # Author (optional for now, can be linked to User if we enforce auth)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     author = relationship("User", backref="posts")
 
     # Extra fields for this app
     department = Column(String, nullable=False, index=True)
-    tags = Column(String, nullable=True) # Comma separated tags
+    tags = Column(String, nullable=True) # Comma separated tags (display); indexed copy in post_tags
     type = Column(String, default="discussion") # discussion, question, announcement
     is_pinned = Column(Boolean, default=False)
     pinned_until = Column(DateTime, nullable=True)
@@ -35,3 +40,36 @@ class Post(Base):
     media_url = Column(String, nullable=True)
     media_public_id = Column(String, nullable=True)
     media_type = Column(String, nullable=True) # image, video
+
+    # Full-text search document: title + content + comments, maintained by triggers (app.db.search).
+    # Deferred so feed queries never load it.
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True))
+
+    # Normalized tags for filtering (kept in step with `tags` by crud.post.set_post_tags)
+    tag_rows = relationship("PostTag", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Keyset feed paging: (created_at, id) range scans, optionally per department
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_department_created_at_id", "department", "created_at", "id"),
+        # Pinned section of the feed (pinned posts are few)
+        Index("ix_posts_pinned_created_at_id", "created_at", "id", postgresql_where=text("is_pinned IS TRUE")),
+        # Trending: ordered scan by score, recency as tie-breaker
+        Index("ix_posts_popularity_score_created_at", "popularity_score", "created_at"),
+        # Full-text search
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+install_on_create(Post.__table__, POSTS_SEARCH_TRIGGER)
+
+class PostTag(Base):
+    """One row per (post, tag); tags are stored lowercased."""
+    __tablename__ = "post_tags"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String, primary_key=True)
+
+    __table_args__ = (
+        # Tag filters: index lookup by tag, post ids straight from the index
+        Index("ix_post_tags_tag_post_id", "tag", "post_id"),
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, BigInteger, DateTime, Text, func
+from app.db.session import Base
+
+class PubSubSpill(Base):
+    """
+    Bus messages too large for a NOTIFY payload (app.core.pubsub).
+
+    The publisher stores the JSON here and notifies only the id; every worker
+    reads the row back. Rows are purged by the publisher after a few minutes.
+    """
+    __tablename__ = "pubsub_spill"
+
+    id = Column(BigInteger, primary_key=True)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
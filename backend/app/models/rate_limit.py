@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, BigInteger, String
+from app.db.session import Base
+
+class RateLimitCounter(Base):
+    """
+    Sliding-window counter state for one rate-limit key, shared by all workers.
+    
+    Two fixed windows (previous and current) are enough to approximate a
+    sliding window, so each key is a single small row.
+    """
+    __tablename__ = "rate_limits"
+
+    key = Column(String, primary_key=True)      # "<limiter>:<client>"
+    window_start = Column(BigInteger, nullable=False)  # Epoch seconds of the current window
+    prev_count = Column(Integer, nullable=False, default=0)
+    curr_count = Column(Integer, nullable=False, default=0)
+    expires_at = Column(BigInteger, nullable=False, index=True)  # Row is stale after this (epoch seconds)
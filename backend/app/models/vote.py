@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Enum, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 import enum
@@ -22,4 +22,7 @@ class Vote(Base):
     __table_args__ = (
         UniqueConstraint('user_id', 'post_id', name='unique_user_post_vote'),
         UniqueConstraint('user_id', 'comment_id', name='unique_user_comment_vote'),
+        # Target-side lookups (post/comment deletes, FK checks); the unique constraints lead with user_id
+        Index("ix_votes_post_id", "post_id", postgresql_where=text("post_id IS NOT NULL")),
+        Index("ix_votes_comment_id", "comment_id", postgresql_where=text("comment_id IS NOT NULL")),
     )
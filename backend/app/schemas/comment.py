@@ -23,6 +23,11 @@ class Comment(CommentBase):
     replies: List['Comment'] = []
     reactions: List[ReactionResponse] = []
     
+    # Threaded responses: replies were cut off here; expand via
+    # GET /posts/{post_id}/comments/{id}/replies?cursor={replies_cursor}
+    has_more_replies: bool = False
+    replies_cursor: Optional[str] = None
+    
     # Vote info
     upvotes: int = 0
     downvotes: int = 0
@@ -48,3 +48,8 @@ class Post(PostBase):
 
     class Config:
         from_attributes = True
+
+
+class PostSearchResult(Post):
+    rank: float
+    headline: str  # Best-matching fragment of the content, HTML-escaped, matches wrapped in <mark></mark>
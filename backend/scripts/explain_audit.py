@@ -0,0 +1,246 @@
+import sys
+import os
+import json
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db import session
+from app.core.config import settings
+from sqlalchemy import delete, event, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from fastapi import Response
+
+USAGE = """
+Usage: python scripts/explain_audit.py [--verbose]
+
+Seeds a throwaway data set inside one transaction (rolled back at the end),
+runs the hot endpoints' real queries, EXPLAIN ANALYZEs each one with the
+default planner settings and exits 1 if any plan reads far more rows than it
+returns: a Seq Scan over a non-trivial table, or a scan whose Filter throws
+away most of what it reads (e.g. a full index scan used only for its order).
+Run against a schema that is migrated to head.
+
+  --verbose   print every plan, not just the offending ones
+"""
+
+# Modest but non-trivial: enough rows that the planner's choices are real
+SEED = [
+    """
+    INSERT INTO users (email, username, full_name, role, is_active, auth_provider, created_at)
+    SELECT 'audit' || g || '@audit.example.com', 'audit_user_' || g, 'Audit User ' || g, 'student', true, 'local',
+           now() - interval '400 days'
+    FROM generate_series(1, 500) g
+    """,
+    """
+    INSERT INTO posts (title, content, department, tags, type, author_id, created_at, is_anonymous, is_pinned,
+                       upvotes, downvotes, comments_count, share_count, popularity_score)
+    SELECT 'Audit post ' || g, 'exam schedule internship notes ' || g || CASE WHEN g % 200 = 0 THEN ' hackathon' ELSE '' END,
+           (ARRAY['CSE', 'ECE', 'ME', 'CE'])[1 + g % 4], 'academic,event', 'discussion',
+           (SELECT min(id) FROM users WHERE email LIKE '%@audit.example.com') + g % 500,
+           now() - (g || ' minutes')::interval, false, g % 2000 = 0, 0, 0, 0, 0, g % 97
+    FROM generate_series(1, 20000) g
+    """,
+    """
+    INSERT INTO post_tags (post_id, tag)
+    SELECT p.id, t.tag FROM posts p CROSS JOIN (VALUES ('academic'), ('event')) t(tag)
+    WHERE p.title LIKE 'Audit post %'
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO comments (content, post_id, author_id, created_at, upvotes, downvotes)
+    SELECT 'Audit comment ' || g, p.id, p.author_id, p.created_at + (g || ' seconds')::interval, 0, 0
+    FROM posts p CROSS JOIN generate_series(1, 3) g
+    WHERE p.title LIKE 'Audit post %'
+    """,
+    """
+    INSERT INTO comments (content, post_id, author_id, parent_id, created_at, upvotes, downvotes)
+    SELECT 'Audit reply', c.post_id, c.author_id, c.id, c.created_at + interval '1 minute', 0, 0
+    FROM comments c WHERE c.content LIKE 'Audit comment %'
+    """,
+    """
+    INSERT INTO votes (user_id, post_id, vote_type)
+    SELECT u.id, p.id, 1
+    FROM (SELECT id FROM users WHERE email LIKE '%@audit.example.com' ORDER BY id LIMIT 5) u
+    CROSS JOIN (SELECT id FROM posts WHERE title LIKE 'Audit post %') p
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO votes (user_id, comment_id, vote_type)
+    SELECT c.author_id, c.id, -1 FROM comments c WHERE c.content LIKE 'Audit comment %'
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO reactions (user_id, comment_id, emoji, created_at)
+    SELECT c.author_id, c.id, 'heart', now() FROM comments c WHERE c.content LIKE 'Audit comment %'
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO notifications (recipient_id, sender_id, type, title, message, reference_id, reference_type,
+                               is_read, created_at, actor_count)
+    SELECT u.id, u.id, 'comment', 'New Comment', 'Audit notification', g, 'post', g % 3 = 0,
+           now() - (g || ' hours')::interval, 1
+    FROM (SELECT id FROM users WHERE email LIKE '%@audit.example.com') u CROSS JOIN generate_series(1, 40) g
+    """,
+    """
+    INSERT INTO announcements (title, message, created_at)
+    SELECT 'Audit announcement ' || g, 'Audit', now() - (g || ' days')::interval FROM generate_series(1, 200) g
+    """,
+]
+
+ANALYZE_TABLES = ("users", "posts", "post_tags", "comments", "votes", "reactions", "notifications", "announcements")
+
+
+class QueryRecorder:
+    """Collects the statements a code path sends to the database, tagged with a label."""
+
+    def __init__(self):
+        self.label = None
+        self.queries = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.label and not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            self.queries.append((self.label, statement, parameters))
+
+    def add(self, label, stmt, conn):
+        compiled = stmt.compile(dialect=conn.dialect)
+        self.queries.append((label, str(compiled), compiled.params))
+
+
+# A Seq Scan reading more rows than this is a missing index, not a small lookup table
+SEQ_SCAN_ROWS = 1000
+# A Filter discarding more rows than this (and most of what the scan reads) means the
+# index only narrows the search a little, or is only used for its sort order
+FILTERED_ROWS = 1000
+
+
+def _problems(plan: dict) -> list:
+    """Scan nodes of an EXPLAIN ANALYZE plan that read many more rows than they keep."""
+    found = []
+    if "Relation Name" in plan:
+        loops = plan.get("Actual Loops", 1)
+        kept = plan.get("Actual Rows", 0) * loops
+        removed = plan.get("Rows Removed by Filter", 0) * loops
+        node = f"{plan['Node Type']} on {plan['Relation Name']}"
+        if plan["Node Type"] == "Seq Scan" and kept + removed > SEQ_SCAN_ROWS:
+            found.append(f"{node} read {kept + removed} rows")
+        elif removed > FILTERED_ROWS and removed > kept:
+            found.append(f"{node} filtered out {removed} of {kept + removed} rows")
+    for child in plan.get("Plans", []):
+        found.extend(_problems(child))
+    return found
+
+
+def _indexes(plan: dict) -> list:
+    found = [plan["Index Name"]] if "Index Name" in plan else []
+    for child in plan.get("Plans", []):
+        found.extend(_indexes(child))
+    return found
+
+
+def run_endpoints(db: Session, recorder: QueryRecorder, conn):
+    """Drive the hot read paths through their real code, plus the vote write statements."""
+    from app.api import posts, comments, notifications
+    from app.crud.notification import unread_count_query
+    from app.models.post import Post
+    from app.models.user import User
+    from app.models.vote import Vote
+
+    user = db.query(User).filter(User.email == "audit1@audit.example.com").one()
+    post = db.query(Post).filter(Post.title == "Audit post 10").one()
+
+    def step(label, fn):
+        recorder.label = label
+        try:
+            return fn()
+        finally:
+            recorder.label = None
+
+    first = step("feed", lambda: posts.read_posts(
+        skip=0, limit=20, department=None, tags=None, tag_match="any", cursor=None, db=db, current_user=user))
+    cursor = first.headers.get("X-Next-Cursor")
+    if cursor:
+        step("feed (next page)", lambda: posts.read_posts(
+            skip=0, limit=20, department=None, tags=None, tag_match="any", cursor=cursor, db=db, current_user=user))
+    step("feed by department", lambda: posts.read_posts(
+        skip=0, limit=20, department="CSE", tags=None, tag_match="any", cursor=None, db=db, current_user=user))
+    step("feed by tag (any)", lambda: posts.read_posts(
+        skip=0, limit=20, department=None, tags="event", tag_match="any", cursor=None, db=db, current_user=user))
+    step("feed by tag (all)", lambda: posts.read_posts(
+        skip=0, limit=20, department=None, tags="academic,event", tag_match="all", cursor=None, db=db,
+        current_user=user))
+    step("popular", lambda: posts.get_popular_posts(timeframe="week", skip=0, limit=20, db=db, current_user=user))
+    step("search", lambda: posts.search_posts(
+        Response(), q="hackathon", department=None, cursor=None, limit=20, db=db, current_user=user))
+    step("post detail", lambda: posts.read_post(post_id=post.id, db=db, current_user=user))
+    step("comments (flat)", lambda: comments.get_comments_endpoint(
+        post_id=post.id, response=Response(), threaded=False, cursor=None, limit=20,
+        replies_limit=5, depth=3, db=db, current_user=user))
+    step("comments (threaded)", lambda: comments.get_comments_endpoint(
+        post_id=post.id, response=Response(), threaded=True, cursor=None, limit=20,
+        replies_limit=5, depth=3, db=db, current_user=user))
+    step("notifications", lambda: notifications.get_notifications(
+        Response(), skip=0, limit=20, cursor=None, db=db, current_user=user))
+    step("unread count", lambda: db.execute(unread_count_query(user.id)).scalar())
+
+    # crud.vote.apply_vote is async; EXPLAIN the same statements it issues
+    recorder.add("vote toggle-off", delete(Vote).where(
+        Vote.user_id == user.id, Vote.post_id == post.id, Vote.vote_type == 1
+    ).returning(Vote.id), conn)
+    upsert = pg_insert(Vote).values(user_id=user.id, post_id=post.id, vote_type=-1)
+    recorder.add("vote upsert", upsert.on_conflict_do_update(
+        index_elements=[Vote.user_id, Vote.post_id],
+        index_where=Vote.post_id.isnot(None),
+        set_={"vote_type": upsert.excluded.vote_type},
+        where=Vote.vote_type != upsert.excluded.vote_type,
+    ), conn)
+
+
+def explain_audit(verbose: bool = False) -> int:
+    print("🔄 Auditing query plans (seeded, rolled back)...")
+    session.init_db(settings.SQLALCHEMY_DATABASE_URL)
+    recorder = QueryRecorder()
+    failures = 0
+    with session.engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            for statement in SEED:
+                conn.execute(text(statement))
+            for table in ANALYZE_TABLES:
+                conn.execute(text(f"ANALYZE {table}"))
+            event.listen(conn, "before_cursor_execute", recorder)
+            try:
+                with Session(bind=conn) as db:
+                    run_endpoints(db, recorder, conn)
+            finally:
+                event.remove(conn, "before_cursor_execute", recorder)
+
+            # ANALYZE runs the statements (the vote writes too); all of it is rolled back below
+            for label, statement, parameters in recorder.queries:
+                raw = conn.exec_driver_sql("EXPLAIN (ANALYZE, FORMAT JSON) " + statement, parameters or {}).scalar()
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+                problems = _problems(plan)
+                used = ", ".join(dict.fromkeys(_indexes(plan))) or "-"
+                if problems:
+                    failures += 1
+                    print(f"  ✗ {label}: {'; '.join(problems)}")
+                    print("    " + " ".join(statement.split()))
+                else:
+                    print(f"  ✓ {label}: {used}")
+                if verbose:
+                    print(json.dumps(plan, indent=2))
+        finally:
+            trans.rollback()
+
+    if failures:
+        print(f"❌ Audit Failed: {failures} of {len(recorder.queries)} queries scan far more rows than they return.")
+        return 1
+    print(f"✅ Audit Passed: {len(recorder.queries)} queries, all index-bounded.")
+    return 0
+
+if __name__ == "__main__":
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print(USAGE)
+        sys.exit(0)
+    sys.exit(explain_audit(verbose="--verbose" in sys.argv))
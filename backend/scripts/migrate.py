@@ -0,0 +1,56 @@
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db import session
+from app.db import migrations
+from app.core.config import settings
+
+USAGE = """
+Usage: python scripts/migrate.py [--status]
+
+Applies pending schema migrations (app/db/migrations) in order. Run once per
+deploy, before the web workers start; exits 1 if a migration fails so the
+deploy stops instead of serving an old schema.
+
+  --status    list applied and pending migrations without changing anything
+"""
+
+def status():
+    session.init_db(settings.SQLALCHEMY_DATABASE_URL)
+    waiting = {m.version for m in migrations.pending(session.engine)}
+    for m in migrations.load_migrations():
+        print(f"  {'pending' if m.version in waiting else 'applied'}  {m.version:04d}_{m.name}: {m.description}")
+    print(f"{len(waiting)} pending.")
+
+def migrate() -> int:
+    print("🔄 Migrating: applying pending schema migrations...")
+    session.init_db(settings.SQLALCHEMY_DATABASE_URL)
+    try:
+        applied = migrations.upgrade(
+            session.engine,
+            on_apply=lambda m, skipped: print(
+                f"  ✓ {m.version:04d}_{m.name}{' (skipped: PostgreSQL only)' if skipped else ''}"
+            ),
+        )
+    except Exception as e:
+        print(f"❌ Migration Failed: {e}")
+        return 1
+    finally:
+        session.close_db()
+    if applied:
+        print(f"✅ Migration Successful: {len(applied)} migration(s) applied.")
+    else:
+        print("✅ Migration Successful: schema already up to date.")
+    return 0
+
+if __name__ == "__main__":
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print(USAGE)
+        sys.exit(0)
+    if "--status" in sys.argv:
+        status()
+        sys.exit(0)
+    sys.exit(migrate())
@@ -0,0 +1,100 @@
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db import session
+from app.core.config import settings
+from app.crud import retention
+from sqlalchemy import text
+
+USAGE = """
+Usage: python scripts/notification_retention.py [--dry-run] [--vacuum]
+
+  --dry-run   only report how many rows the policy would archive/delete
+  --vacuum    VACUUM (ANALYZE) both tables afterwards so freed space is reusable now
+
+notifications_archive is created by the schema migrations (scripts/migrate.py).
+Exits 1 if the run fails.
+"""
+
+TABLES = ("notifications", "notifications_archive")
+
+def _sizes(conn) -> dict:
+    return {
+        table: conn.execute(text("SELECT pg_total_relation_size(CAST(:t AS regclass))"), {"t": table}).scalar()
+        for table in TABLES
+    }
+
+def _row_bytes(conn, table: str) -> int:
+    """Average on-disk bytes per row (table + indexes), from planner statistics."""
+    size, rows = conn.execute(text("""
+        SELECT pg_total_relation_size(c.oid), c.reltuples
+        FROM pg_class c WHERE c.oid = CAST(:t AS regclass)
+    """), {"t": table}).first()
+    return int(size / rows) if rows and rows > 0 else 0
+
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.1f} MB"
+
+def run_retention(dry_run: bool = False, vacuum: bool = False) -> int:
+    print("🔄 Retention: "
+          f"read > {settings.NOTIFICATION_RETENTION_DAYS}d, "
+          f"unread > {settings.NOTIFICATION_UNREAD_RETENTION_DAYS}d -> archive; "
+          f"archive > {settings.NOTIFICATION_ARCHIVE_RETENTION_DAYS or '∞'}d -> delete"
+          f"{' (dry run)' if dry_run else ''}")
+    session.init_db(settings.SQLALCHEMY_DATABASE_URL)
+    cutoffs = retention.retention_cutoffs()
+    try:
+        with session.engine.connect() as conn:
+            if dry_run:
+                pending = retention.count_pending(conn, cutoffs)
+                row_bytes = _row_bytes(conn, "notifications")
+                print(f"  Would archive {pending['archivable']} notifications "
+                      f"(~{_mb(pending['archivable'] * row_bytes)} of the hot table)")
+                print(f"  Would delete {pending['purgeable']} archived notifications")
+                return 0
+
+            before = _sizes(conn)
+            hot_row_bytes = _row_bytes(conn, "notifications")
+            archive_row_bytes = _row_bytes(conn, "notifications_archive")
+            conn.commit()
+
+            archived = retention.archive_notifications(
+                conn, cutoffs, on_batch=lambda n: print(f"  ...archived {n}")
+            )
+            purged = retention.purge_archive(
+                conn, cutoffs, on_batch=lambda n: print(f"  ...deleted {n} archived")
+            )
+
+        if vacuum:
+            # VACUUM can't run inside a transaction block
+            with session.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                for table in TABLES:
+                    conn.execute(text(f"VACUUM (ANALYZE) {table}"))
+
+        with session.engine.connect() as conn:
+            after = _sizes(conn)
+
+        print(f"  Archived {archived} notifications, deleted {purged} archived notifications")
+        # Plain VACUUM makes dead rows' space reusable; the files themselves rarely shrink
+        print(f"  Reclaimed in notifications: ~{_mb(archived * hot_row_bytes)} "
+              f"(reusable {'now' if vacuum else 'after the next autovacuum'})")
+        if purged:
+            print(f"  Reclaimed in notifications_archive: ~{_mb(purged * archive_row_bytes)}")
+        for table in TABLES:
+            print(f"  {table}: {_mb(before[table])} -> {_mb(after[table])} on disk")
+        print("✅ Retention complete.")
+        return 0
+    except Exception as e:
+        print(f"❌ Retention Failed: {e}")
+        return 1
+    finally:
+        session.close_db()
+
+if __name__ == "__main__":
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print(USAGE)
+        sys.exit(0)
+    sys.exit(run_retention(dry_run="--dry-run" in sys.argv, vacuum="--vacuum" in sys.argv))
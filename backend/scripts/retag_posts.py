@@ -0,0 +1,110 @@
+import sys
+import os
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db import session
+from app.core.config import settings
+from app.core.autotag import auto_tagger
+from app.crud.post import parse_tags
+from app.models.post import Post, PostTag
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+USAGE = """
+Usage: python scripts/retag_posts.py [--dry-run] [--prune]
+
+  --dry-run   only report how many posts would change
+  --prune     also remove auto-tags the old substring matcher added that the
+              current matcher no longer produces (e.g. "Academic" for "available")
+"""
+
+BATCH_SIZE = 1000
+
+def prune_stale_tags(tags: str, text: str) -> str:
+    """
+    Drop taxonomy tags that only the old substring matcher would have added.
+
+    The old create_post appended auto-tags, spelled exactly as in the taxonomy,
+    after the user's own tags. So only that trailing run of taxonomy tags is
+    considered; anything the user typed before it (or spelled differently) is
+    kept, as is any tag the current matcher still produces.
+    """
+    current = [t.strip() for t in (tags or "").split(",") if t.strip()]
+    start = len(current)
+    while start > 0 and current[start - 1] in auto_tagger.keywords:
+        start -= 1
+    matched = set(auto_tagger.match(text))
+    lower = text.lower()
+    kept = current[:start] + [
+        tag for tag in current[start:]
+        if tag in matched or not any(k in lower for k in auto_tagger.keywords[tag])
+    ]
+    return ",".join(kept) if kept else None
+
+def retag_posts(dry_run: bool = False, prune: bool = False):
+    """
+    Re-run the auto-tagger over every existing post, in id-ordered batches.
+    
+    By default tags are only added (manual tags and earlier auto-tags are
+    kept); with prune, stale auto-tags are removed too (see prune_stale_tags).
+    post_tags is updated alongside posts.tags.
+    """
+    print(f"🔄 Migrating: Re-tagging posts with {len(auto_tagger.tags)} auto-tags"
+          f"{' and pruning stale ones' if prune else ''}{' (dry run)' if dry_run else ''}...")
+    session.init_db(settings.SQLALCHEMY_DATABASE_URL)
+    session.import_models()  # Post's relationships need every model mapped
+    scanned = changed = 0
+    last_id = 0
+    try:
+        with session.engine.connect() as conn:
+            while True:
+                rows = conn.execute(
+                    select(Post.id, Post.title, Post.content, Post.tags)
+                    .where(Post.id > last_id)
+                    .order_by(Post.id)
+                    .limit(BATCH_SIZE)
+                ).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                scanned += len(rows)
+                
+                updates = []
+                for row in rows:
+                    text = f"{row.title} {row.content}"
+                    tags = auto_tagger.apply(row.tags, text)
+                    if prune:
+                        tags = prune_stale_tags(tags, text)
+                    if tags != row.tags:
+                        updates.append({"post_id": row.id, "new_tags": tags})
+                changed += len(updates)
+                if dry_run or not updates:
+                    continue
+                
+                conn.execute(
+                    update(Post.__table__)
+                    .where(Post.__table__.c.id == bindparam("post_id"))
+                    .values(tags=bindparam("new_tags")),
+                    updates
+                )
+                if prune:
+                    conn.execute(delete(PostTag).where(PostTag.post_id.in_([u["post_id"] for u in updates])))
+                tag_rows = [
+                    {"post_id": u["post_id"], "tag": tag}
+                    for u in updates for tag in parse_tags(u["new_tags"])
+                ]
+                if tag_rows:
+                    conn.execute(pg_insert(PostTag).on_conflict_do_nothing(), tag_rows)
+                conn.commit()
+                print(f"  ...{scanned} scanned, {changed} re-tagged")
+        print(f"✅ Migration Successful: {changed} of {scanned} posts {'would be ' if dry_run else ''}re-tagged.")
+    except Exception as e:
+        print(f"❌ Migration Failed: {e}")
+
+if __name__ == "__main__":
+    if "--help" in sys.argv or "-h" in sys.argv:
+        print(USAGE)
+        sys.exit(0)
+    retag_posts(dry_run="--dry-run" in sys.argv, prune="--prune" in sys.argv)
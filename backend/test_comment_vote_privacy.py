@@ -0,0 +1,60 @@
+import os
+import sys
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from fastapi.testclient import TestClient
+
+import app.db.session as db_session
+from app.models.user import User
+from app.models.post import Post
+from app.models.comment import Comment
+from app.models.vote import Vote
+from app.main import app
+
+db_session.import_models()
+
+def test_anonymous_user_id_gets_no_votes():
+    print("--- Comment votes are only shown to their owner ---")
+
+    # Throwaway in-memory database so the test needs no server
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    db_session.engine = engine
+    db_session.SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    db_session.Base.metadata.create_all(engine)
+
+    db = db_session.SessionLocal()
+    try:
+        voter = User(email="voter@example.com", username="voter", full_name="Voter")
+        db.add(voter)
+        db.commit()
+        post = Post(title="Thread", content="Body", department="CSE", author_id=voter.id)
+        db.add(post)
+        db.commit()
+        comment = Comment(content="Comment", post_id=post.id, author_id=voter.id)
+        db.add(comment)
+        db.commit()
+        db.add(Vote(user_id=voter.id, comment_id=comment.id, vote_type=1))
+        db.commit()
+        print(f"1. User {voter.id} upvoted comment {comment.id}")
+
+        client = TestClient(app)
+        for path in (
+            f"/posts/{post.id}/comments/?user_id={voter.id}",
+            f"/posts/{post.id}/comments/?user_id={voter.id}&threaded=true",
+            f"/posts/{post.id}/comments/{comment.id}/replies?user_id={voter.id}",
+        ):
+            res = client.get(path)
+            assert res.status_code == 200, res.text
+            assert all(c["user_vote"] is None for c in res.json()), res.json()
+            print(f"2. {path}: no votes leaked")
+    finally:
+        db.close()
+        db_session.Base.metadata.drop_all(engine)
+
+if __name__ == "__main__":
+    test_anonymous_user_id_gets_no_votes()
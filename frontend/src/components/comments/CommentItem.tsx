@@ -1,5 +1,5 @@
-import { useState } from 'react';
-import { createComment, toggleReaction } from '@/lib/api';
+import { useState, useEffect } from 'react';
+import { createComment, toggleReaction, getReplies } from '@/lib/api';
 import CommentForm from './CommentForm';
 import ReactionPicker from '@/components/common/ReactionPicker';
 
@@ -17,6 +17,31 @@ interface CommentItemProps {
 export default function CommentItem({ comment, postId, depth = 0, currentUserId, onReplySuccess }: CommentItemProps) {
     const [isReplying, setIsReplying] = useState(false);
     const [reactions, setReactions] = useState(comment.reactions || []);
+    // Replies arrive bounded; the rest of a branch is fetched on demand
+    const [replies, setReplies] = useState<any[]>(comment.replies || []);
+    const [hasMoreReplies, setHasMoreReplies] = useState(!!comment.has_more_replies);
+    const [repliesCursor, setRepliesCursor] = useState<string | null>(comment.replies_cursor || null);
+    const [isLoadingReplies, setIsLoadingReplies] = useState(false);
+
+    useEffect(() => {
+        setReplies(comment.replies || []);
+        setHasMoreReplies(!!comment.has_more_replies);
+        setRepliesCursor(comment.replies_cursor || null);
+    }, [comment]);
+
+    const loadReplies = async () => {
+        setIsLoadingReplies(true);
+        try {
+            const { replies: more, nextCursor } = await getReplies(postId, comment.id, repliesCursor);
+            setReplies(prev => [...prev, ...more]);
+            setRepliesCursor(nextCursor);
+            setHasMoreReplies(!!nextCursor);
+        } catch (error) {
+            console.error("Failed to load replies", error);
+        } finally {
+            setIsLoadingReplies(false);
+        }
+    };
 
     const handleReply = async (content: string) => {
         await createComment(postId, content, comment.id);
@@ -132,9 +157,9 @@ export default function CommentItem({ comment, postId, depth = 0, currentUserId,
             )}
 
             {/* Recursive Replies */}
-            {comment.replies && comment.replies.length > 0 && (
+            {replies.length > 0 && (
                 <div>
-                    {comment.replies.map((reply: any) => (
+                    {replies.map((reply: any) => (
                         <CommentItem
                             key={reply.id}
                             comment={reply}
@@ -146,6 +171,16 @@ export default function CommentItem({ comment, postId, depth = 0, currentUserId,
                     ))}
                 </div>
             )}
+
+            {hasMoreReplies && (
+                <button
+                    onClick={loadReplies}
+                    disabled={isLoadingReplies}
+                    className="mt-2 ml-11 text-xs font-medium text-blue-600 hover:text-blue-700 transition-colors disabled:opacity-50"
+                >
+                    {isLoadingReplies ? 'Loading replies...' : replies.length > 0 ? 'View more replies' : 'View replies'}
+                </button>
+            )}
         </div>
     );
 }
@@ -14,7 +14,9 @@ interface CommentSectionProps {
 export default function CommentSection({ postId, initialCount = 0, currentUserId }: CommentSectionProps) {
     /* eslint-disable @typescript-eslint/no-explicit-any */
     const [comments, setComments] = useState<any[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [isLoading, setIsLoading] = useState(false);
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
     const [isOpen, setIsOpen] = useState(false);
     const [count, setCount] = useState(initialCount);
     const [sortOption, setSortOption] = useState<SortOption>('newest');
@@ -28,33 +30,13 @@ export default function CommentSection({ postId, initialCount = 0, currentUserId
         });
     };
 
+    // First page of the thread, already nested by the server (bounded size)
     const fetchComments = useCallback(async () => {
         setIsLoading(true);
         try {
-            const data = await getComments(postId);
-            // Process flat list into tree
-            const commentMap: any = {};
-            const roots: any[] = [];
-
-            // First pass: create map
-            data.forEach((c: any) => {
-                c.replies = [];
-                commentMap[c.id] = c;
-            });
-
-            // Second pass: link properties
-            data.forEach((c: any) => {
-                if (c.parent_id) {
-                    if (commentMap[c.parent_id]) {
-                        commentMap[c.parent_id].replies.push(c);
-                    }
-                } else {
-                    roots.push(c);
-                }
-            });
-
+            const { comments: roots, nextCursor: cursor } = await getComments(postId);
             setComments(roots);
-            setCount(data.length);
+            setNextCursor(cursor);
         } catch (error) {
             console.error("Failed to fetch comments", error);
         } finally {
@@ -62,6 +44,20 @@ export default function CommentSection({ postId, initialCount = 0, currentUserId
         }
     }, [postId]);
 
+    const loadMoreComments = async () => {
+        if (!nextCursor) return;
+        setIsLoadingMore(true);
+        try {
+            const { comments: roots, nextCursor: cursor } = await getComments(postId, nextCursor);
+            setComments(prev => [...prev, ...roots]);
+            setNextCursor(cursor);
+        } catch (error) {
+            console.error("Failed to load more comments", error);
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
+
     useEffect(() => {
         if (isOpen) {
             fetchComments();
@@ -70,6 +66,7 @@ export default function CommentSection({ postId, initialCount = 0, currentUserId
 
     const handleAddComment = async (content: string) => {
         await createComment(postId, content);
+        setCount(c => c + 1);
         fetchComments(); // Refresh list
     };
 
@@ -134,6 +131,16 @@ export default function CommentSection({ postId, initialCount = 0, currentUserId
                                         onReplySuccess={fetchComments}
                                     />
                                 ))}
+
+                                {!isLoading && nextCursor && (
+                                    <button
+                                        onClick={loadMoreComments}
+                                        disabled={isLoadingMore}
+                                        className="w-full text-sm font-medium text-slate-500 hover:text-blue-600 py-2 transition-colors disabled:opacity-50"
+                                    >
+                                        {isLoadingMore ? 'Loading...' : 'Load more comments'}
+                                    </button>
+                                )}
                             </div>
                         </div>
                     </motion.div>
@@ -2,7 +2,7 @@
 
 import { useState, useRef, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
-import { getNotifications, markNotificationRead, markAllNotificationsRead, getCurrentUser } from '@/lib/api'; // Check path
+import { getNotifications, getUnreadNotificationCount, markNotificationRead, markAllNotificationsRead, getCurrentUser } from '@/lib/api'; // Check path
 import { useAuth } from '@/context/AuthContext';
 import { useSocket } from '@/context/SocketContext';
 
@@ -62,6 +62,8 @@ export default function NotificationDropdown() {
     const [isOpen, setIsOpen] = useState(false);
     const [activeTab, setActiveTab] = useState<'all' | 'academic' | 'social'>('all');
     const [notifications, setNotifications] = useState<Notification[]>([]);
+    // Server-side badge count (covers more than the loaded page); null until fetched
+    const [serverUnread, setServerUnread] = useState<number | null>(null);
     const { user } = useAuth();
     const dropdownRef = useRef<HTMLDivElement>(null);
 
@@ -85,13 +87,14 @@ export default function NotificationDropdown() {
                 raw_created_at: n.created_at // Keep for sorting/timeago
             }));
             setNotifications(mapped);
+            setServerUnread(await getUnreadNotificationCount());
         } catch (error) {
             console.error("Failed to fetch notifications", error);
         }
     };
 
     // WebSocket Connection
-    const { lastMessage } = useSocket();
+    const { subscribe } = useSocket();
 
     useEffect(() => {
         if (!user) return;
@@ -99,28 +102,38 @@ export default function NotificationDropdown() {
         fetchNotifications();
     }, [user]);
 
-    // Handle incoming messages
-    useEffect(() => {
-        if (!lastMessage) return;
-
+    // Handle incoming messages (every one: a notification and its badge count arrive back to back)
+    useEffect(() => subscribe((message: any) => {
         // Ensure it is a notification (simple check, or use types)
         // If message has type 'new_post', we ignore it here (handled in Home)
         // Adjust this if you want notifications about new posts too
-        if (lastMessage.type === 'new_post') return;
+        if (message.type === 'new_post') return;
+
+        // Badge updates pushed by the server
+        if (message.type === 'unread_count') {
+            setServerUnread(message.count);
+            return;
+        }
+        if (message.type === 'announcement') {
+            // The server never counts or lists your own announcement
+            if (message.sender_id === user?.id) return;
+            setServerUnread(prev => (prev === null ? prev : prev + 1));
+        }
 
-        const newNotif = {
-            id: Date.now(),
-            type: lastMessage.type === 'comment' || lastMessage.type === 'upvote' ? 'social' : 'academic',
-            title: lastMessage.title,
-            description: lastMessage.message,
+        const incoming = {
+            id: message.id ?? Date.now(),
+            type: message.type === 'comment' || message.type === 'upvote' ? 'social' : 'academic',
+            title: message.title,
+            description: message.message,
             time: 'Just now',
             isRead: false,
-            sender: lastMessage.sender,
-            raw_created_at: new Date().toISOString()
-        };
+            sender: message.sender,
+            raw_created_at: message.created_at ?? new Date().toISOString()
+        } as Notification;
 
-        setNotifications(prev => [newNotif as Notification, ...prev]);
-    }, [lastMessage]);
+        // Aggregated notifications ("X and N others ...") keep their server id: update in place
+        setNotifications(prev => [incoming, ...prev.filter(n => n.id !== incoming.id)]);
+    }), [subscribe, user]);
 
     // Close on click outside
     useEffect(() => {
@@ -133,7 +146,7 @@ export default function NotificationDropdown() {
         return () => document.removeEventListener('mousedown', handleClickOutside);
     }, []);
 
-    const unreadCount = notifications.filter(n => !n.isRead).length;
+    const unreadCount = serverUnread ?? notifications.filter(n => !n.isRead).length;
 
     const filteredNotifications = notifications.filter(n => {
         if (activeTab === 'all') return true;
@@ -146,6 +159,7 @@ export default function NotificationDropdown() {
     const markAllAsRead = async () => {
         // Optimistic
         setNotifications(prev => prev.map(n => ({ ...n, isRead: true })));
+        setServerUnread(0);
         await markAllNotificationsRead();
     };
 
@@ -1,12 +1,14 @@
 'use client';
 
-import React, { createContext, useContext, useEffect, useState, ReactNode } from 'react';
+import React, { createContext, useCallback, useContext, useEffect, useRef, useState, ReactNode } from 'react';
 import { useAuth } from '@/context/AuthContext';
 
 interface SocketContextType {
     socket: WebSocket | null;
     isConnected: boolean;
     lastMessage: any | null;
+    // Called for every message; lastMessage alone can skip messages that arrive back to back
+    subscribe: (handler: (message: any) => void) => () => void;
 }
 
 const SocketContext = createContext<SocketContextType | undefined>(undefined);
@@ -16,6 +18,14 @@ export function SocketProvider({ children }: { children: ReactNode }) {
     const [socket, setSocket] = useState<WebSocket | null>(null);
     const [isConnected, setIsConnected] = useState(false);
     const [lastMessage, setLastMessage] = useState<any | null>(null);
+    const handlers = useRef(new Set<(message: any) => void>());
+
+    const subscribe = useCallback((handler: (message: any) => void) => {
+        handlers.current.add(handler);
+        return () => {
+            handlers.current.delete(handler);
+        };
+    }, []);
 
     useEffect(() => {
         if (!user) {
@@ -47,6 +57,7 @@ export function SocketProvider({ children }: { children: ReactNode }) {
         ws.onmessage = (event) => {
             try {
                 const data = JSON.parse(event.data);
+                handlers.current.forEach(handler => handler(data));
                 setLastMessage(data);
             } catch (e) {
                 console.error("Failed to parse WS message", e);
@@ -61,7 +72,7 @@ export function SocketProvider({ children }: { children: ReactNode }) {
     }, [user]); // Re-connect if user changes
 
     return (
-        <SocketContext.Provider value={{ socket, isConnected, lastMessage }}>
+        <SocketContext.Provider value={{ socket, isConnected, lastMessage, subscribe }}>
             {children}
         </SocketContext.Provider>
     );
@@ -139,9 +139,21 @@ export const sharePost = async (postId: number) => {
 };
 
 // Comments
-export const getComments = async (postId: number) => {
-  const response = await api.get(`/posts/${postId}/comments/`);
-  return response.data;
+// One bounded page of the thread (top-level comments with their first replies).
+// nextCursor loads more top-level comments; truncated branches expand via getReplies.
+export const getComments = async (postId: number, cursor?: string | null) => {
+  const response = await api.get(`/posts/${postId}/comments/`, {
+    params: { threaded: true, cursor: cursor || undefined }
+  });
+  return { comments: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+};
+
+// Next replies of a comment; pass the comment's replies_cursor to skip the ones already shown
+export const getReplies = async (postId: number, commentId: number, cursor?: string | null) => {
+  const response = await api.get(`/posts/${postId}/comments/${commentId}/replies`, {
+    params: { cursor: cursor || undefined }
+  });
+  return { replies: response.data, nextCursor: response.headers['x-next-cursor'] || null };
 };
 
 export const createComment = async (postId: number, content: string, parentId?: number) => {
@@ -188,6 +200,11 @@ export const getNotifications = async (skip = 0, limit = 20) => {
   return response.data;
 };
 
+export const getUnreadNotificationCount = async () => {
+  const response = await api.get(`/notifications/unread-count`);
+  return response.data.count as number;
+};
+
 export const markNotificationRead = async (notificationId: number) => {
   const response = await api.put(`/notifications/${notificationId}/read`);
   return response.data;